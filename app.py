@@ -1,12 +1,80 @@
-from flask import Flask
+from flask import Blueprint, Flask, Response, g, request
+import hashlib
+import html
 import json
+import logging
 import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
 import pandas as pd
 import numpy as np
 import altair as alt
-app = Flask(__name__)
 
-@app.get("/")
+try:
+    import vl_convert
+except ImportError:  # only needed to render /shots/frame images
+    vl_convert = None
+
+import profiling
+from frame_cache import FRAME_MIMETYPES, FrameCache, frame_key
+from metrics import BYTE_BUCKETS, CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from shots_data import ZONES, ShotIndex, ShotsFrame, add_game_number, hexbin
+
+# All routes live on this blueprint; create_app() builds the Flask app around it
+bp = Blueprint("nba", __name__)
+log = logging.getLogger(__name__)
+
+# Prometheus metrics, served at /metrics (per process)
+REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests by route, method and status.",
+                            ["route", "method", "status"])
+REQUEST_SECONDS = REGISTRY.histogram("http_request_duration_seconds", "Request handling time by route.", ["route"])
+RESPONSE_BYTES = REGISTRY.histogram("http_response_bytes", "Response body size by route.", ["route"],
+                                    buckets=BYTE_BUCKETS)
+STAGE_SECONDS = REGISTRY.histogram("shots_stage_duration_seconds", "Time spent in each shots pipeline stage.",
+                                   ["stage"])
+CACHE_LOOKUPS = REGISTRY.counter("shots_cache_lookups_total", "Shots dataset/page/density/frame cache lookups by result.",
+                                 ["cache", "result"])
+SHOTS_ROWS = REGISTRY.gauge("shots_dataset_rows", "Rows in the loaded shots dataset.")
+SHOTS_BYTES = REGISTRY.gauge("shots_dataset_bytes", "Memory held by the loaded shots arrays.")
+
+
+@bp.before_app_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+    # Opt-in sampling profile of this request (see profiling.py)
+    if profiling.requested(request.headers.get(profiling.PROFILE_HEADER) or request.args.get("profile")):
+        g.profiler = profiling.start()
+
+
+@bp.after_app_request
+def _record_request(resp: Response) -> Response:
+    # Label by route pattern, not URL, to keep the number of series bounded
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    profile_path = profiling.finish(g.pop("profiler", None), f"{request.method} {route}")
+    if profile_path is not None:
+        resp.headers["X-Profile-File"] = profile_path.name
+    REQUESTS.inc(route=route, method=request.method, status=resp.status_code)
+    REQUEST_SECONDS.observe(time.perf_counter() - g.get("request_start", time.perf_counter()), route=route)
+    if resp.content_length is not None:
+        RESPONSE_BYTES.observe(resp.content_length, route=route)
+    return resp
+
+
+@bp.teardown_app_request
+def _finish_profile(exc):
+    # Only still set if the request failed before after_request ran
+    profiling.finish(g.pop("profiler", None), f"{request.method} {request.path} failed")
+
+
+@bp.get("/metrics")
+def metrics():
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+@bp.get("/")
 def hello():
     return (
         """
@@ -16,7 +84,7 @@ def hello():
     )
 
 
-@app.get("/explorer")
+@bp.get("/explorer")
 def explorer():
     from flask import redirect
     return redirect("http://localhost:8501/nba/", code=302)
@@ -70,62 +138,239 @@ def _make_court_df():
     ], ignore_index=True)
     return court_df
 
-def _load_shots_df() -> pd.DataFrame:
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    # Read from the repo shots parquet directly
-    parquet_path = os.path.join(base_dir, "sample_data", "nba_shots_min.parquet")
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Static assets: content-hashed URLs under /assets/, cached forever ---
+ASSETS_DIR = os.path.join(_BASE_DIR, "static")
+VENDOR_DIR = os.path.join(ASSETS_DIR, "vendor")
+# Pinned JS bundles, in load order, committed as static/vendor/<name>.js;
+# scripts/vendor_js.py re-downloads them from these URLs after a version bump
+VENDOR_JS = {
+    "vega": "https://cdn.jsdelivr.net/npm/vega@5.30.0/build/vega.min.js",
+    "vega-lite": "https://cdn.jsdelivr.net/npm/vega-lite@5.20.1/build/vega-lite.min.js",
+    "vega-embed": "https://cdn.jsdelivr.net/npm/vega-embed@6.26.0/build/vega-embed.min.js",
+}
+# First-party scripts loaded after the bundles: the Arrow IPC stream reader for /shots/data
+APP_JS = ["arrow_rows"]
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+class _Asset(NamedTuple):
+    body: bytes
+    mimetype: str
+
+
+_assets: dict = {}
+
+def _register_asset(name: str, ext: str, body: bytes, mimetype: str) -> str:
+    """Serve ``body`` at a URL that embeds its content hash; returns that URL."""
+    hashed_name = f"{name}.{hashlib.sha256(body).hexdigest()[:12]}.{ext}"
+    _assets[hashed_name] = _Asset(body, mimetype)
+    return f"/assets/{hashed_name}"
+
+def _script_urls() -> List[str]:
+    """Hashed /assets/ URLs of every script the /shots page loads; nothing comes from a CDN."""
+    paths = [(name, os.path.join(VENDOR_DIR, f"{name}.js")) for name in VENDOR_JS]
+    paths += [(name, os.path.join(ASSETS_DIR, "js", f"{name}.js")) for name in APP_JS]
+    urls = []
+    for name, path in paths:
+        with open(path, "rb") as f:
+            urls.append(_register_asset(name, "js", f.read(), "text/javascript"))
+    return urls
+
+# The court never changes, so its polylines are computed once and referenced by URL
+_COURT_JSON = _make_court_df().to_json(orient="records", double_precision=3)
+COURT_URL = _register_asset("court", "json", _COURT_JSON.encode("utf-8"), "application/json")
+SCRIPT_URLS = _script_urls()
+
+@bp.get("/assets/<name>")
+def assets(name: str):
+    asset = _assets.get(name)
+    if asset is None:
+        return "Not found", 404
+    resp = Response(asset.body, mimetype=asset.mimetype)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = ASSET_MAX_AGE
+    resp.cache_control.immutable = True
+    return resp
+
+SHOTS_PARQUET = os.path.join(_BASE_DIR, "sample_data", "nba_shots_min.parquet")
+# Enriched store written by scripts/build_shots_store.py; preferred over SHOTS_PARQUET when present
+SHOTS_STORE = os.path.join(_BASE_DIR, "sample_data", "shots_store")
+SHOTS_STORE_MANIFEST = os.path.join(SHOTS_STORE, "_manifest.json")
+# Compact columns of the whole store, memory-mapped read-only (see ShotsFrame.from_arrow_file)
+SHOTS_ARROW = os.path.join(SHOTS_STORE, "_shots.arrow")
+SHOTS_STORE_COLUMNS = ["playerNameI", "gameid", "timeActual", "x", "y", "shotResult", "game_number", "Season"]
+# How often (seconds) the shots cache re-stats the data files to look for changes
+SHOTS_RELOAD_INTERVAL = float(os.environ.get("SHOTS_RELOAD_INTERVAL", "1.0"))
+# Columns shipped per shot to the browser (see ShotsFrame.to_arrow_ipc), and the Vega dataset they are loaded into
+SHOTS_DATA_COLUMNS = ["playerNameI", "gameid", "timeActual", "x", "y", "shotResult", "game_number"]
+SHOTS_DATASET_NAME = "shots"
+ZONES_DATASET_NAME = "zones"
+DENSITY_DATASET_NAME = "density"
+# Where each zone's FG% label sits on the court (court coordinates)
+ZONE_LABEL_POSITIONS = {
+    "restricted_area": (50, 7),
+    "paint": (50, 19),
+    "mid_range": (50, 28.5),
+    "corner_three": (3, 9.5),
+    "above_break_three": (50, 40),
+}
+# Default number of games in the rolling shot-chart window
+SHOTS_WINDOW_SIZE = int(os.environ.get("SHOTS_WINDOW_SIZE", "40"))
+# Chart size in pixels; the court spans x 0-100 and y 4-50
+SHOTS_CHART_WIDTH, SHOTS_CHART_HEIGHT = 700, 400
+# Hexbin view: hexagon circumradius in court x units, and how many (player, window) bins to keep
+SHOTS_HEX_RADIUS = float(os.environ.get("SHOTS_HEX_RADIUS", "2.0"))
+SHOTS_DENSITY_CACHE_SIZE = int(os.environ.get("SHOTS_DENSITY_CACHE_SIZE", "4096"))
+# Pre-rendered frames for image playback (/shots/frame, /shots/play): where they are kept,
+# how much disk they may use, and the PNG pixel ratio
+SHOTS_FRAMES_DIR = os.environ.get("SHOTS_FRAMES_DIR", os.path.join(_BASE_DIR, "frame_cache"))
+SHOTS_FRAMES_CACHE_MB = float(os.environ.get("SHOTS_FRAMES_CACHE_MB", "256"))
+SHOTS_FRAME_SCALE = float(os.environ.get("SHOTS_FRAME_SCALE", "1"))
+# Pointy-top unit hexagon; Vega scales custom shapes so [-1, 1] spans sqrt(size) pixels
+HEXAGON_PATH = "M0,-1L0.866,-0.5L0.866,0.5L0,1L-0.866,0.5L-0.866,-0.5Z"
+
+def _load_shots_df(parquet_path: str = SHOTS_PARQUET) -> pd.DataFrame:
+    if os.path.basename(parquet_path) == os.path.basename(SHOTS_STORE_MANIFEST):
+        # Pre-enriched store: game_number and dtypes are already materialized
+        with STAGE_SECONDS.time(stage="parquet_read"):
+            return pd.read_parquet(os.path.dirname(parquet_path), columns=SHOTS_STORE_COLUMNS)
     if not os.path.exists(parquet_path):
         raise FileNotFoundError(f"shots parquet not found at {parquet_path}")
-    df_small = pd.read_parquet(parquet_path)
-    # Ensure datetime
-    if "timeActual" in df_small.columns:
-        df_small["timeActual"] = pd.to_datetime(df_small["timeActual"])  # ensure dtype
-    # Backfill game_number if missing
+    with STAGE_SECONDS.time(stage="parquet_read"):
+        df_small = pd.read_parquet(parquet_path)
+        # Ensure datetime
+        if "timeActual" in df_small.columns:
+            df_small["timeActual"] = pd.to_datetime(df_small["timeActual"])  # ensure dtype
+    # Backfill game_number if missing (run scripts/build_shots_store.py to avoid this)
     if "game_number" not in df_small.columns and {"playerNameI", "gameid", "timeActual"}.issubset(df_small.columns):
-        player_games = (
-            df_small[["playerNameI", "gameid", "timeActual"]]
-            .dropna(subset=["timeActual"])  # only valid timestamps contribute
-            .drop_duplicates(["playerNameI", "gameid"])  # one row per game
-            .sort_values(["playerNameI", "timeActual", "gameid"])
-        )
-        player_games["game_number"] = player_games.groupby("playerNameI").cumcount() + 1
-        df_small = df_small.merge(
-            player_games[["playerNameI", "gameid", "game_number"]],
-            on=["playerNameI", "gameid"],
-            how="left",
-        )
+        with STAGE_SECONDS.time(stage="game_number"):
+            df_small = add_game_number(df_small)
     return df_small
 
-def _build_shot_chart_spec(df: pd.DataFrame):
-    alt.data_transformers.disable_max_rows()
+def _load_shots_frame(path: str) -> ShotsFrame:
+    if path.endswith(".arrow"):
+        # Mapped, not read: all workers share the file's pages via the page cache
+        with STAGE_SECONDS.time(stage="arrow_mmap"):
+            return ShotsFrame.from_arrow_file(path)
+    df = _load_shots_df(path)
+    with STAGE_SECONDS.time(stage="shots_frame"):
+        return ShotsFrame.from_pandas(df)
 
-    court_df = _make_court_df()
 
-    players = sorted(df["playerNameI"].dropna().unique().tolist())
-    if not players:
-        players = ["Player"]
-        df = pd.DataFrame({
-            "playerNameI": players * 1,
-            "gameid": ["G1"],
-            "timeActual": pd.date_range("2024-01-01", periods=1),
-            "x": [30],
-            "y": [25],
-            "shotResult": ["Made"],
-            "Season": ["2023-24"],
-            "game_number": [1],
-        })
+class ShotsDataset(NamedTuple):
+    frame: ShotsFrame
+    # (path, mtime_ns, size) of the file the frame was loaded from
+    version: tuple
+    index: ShotIndex
 
-    player_dropdown = alt.binding_select(options=players, name="Player: ")
-    player_param = alt.param("player_sel", bind=player_dropdown, value=players[0])
+    @property
+    def fingerprint(self) -> str:
+        path, mtime_ns, size = self.version
+        return f"{zlib.crc32(path.encode()):x}-{mtime_ns:x}-{size:x}"
 
-    window_size = 40
-    max_games = int(df["game_number"].max()) if len(df) else 1
-    slider_max = max(1, max_games - window_size + 1)
-    window_slider = alt.binding_range(min=1, max=slider_max, step=1, name="Start game #: ")
-    window_param = alt.param("gstart", bind=window_slider, value=1)
 
-    court_layer = (
-        alt.Chart(court_df)
+class _ShotsCache:
+    """Process-wide cache of the enriched, compacted shots data.
+
+    ``paths`` are candidate sources in order of preference; the first one that
+    exists and loads is enriched once. Afterwards ``get()`` only re-stats the
+    sources (at most every ``check_interval`` seconds) and swaps in a freshly
+    loaded ``ShotsDataset`` when the chosen file or its mtime/size changes. The
+    swap is a single reference assignment, so requests that already hold the
+    old dataset keep using it. Treat the returned arrays as read-only.
+
+    A source that fails to load is skipped until its mtime/size changes: on a
+    cold start the next candidate is tried instead, later the current copy is
+    kept.
+    """
+
+    def __init__(self, paths: List[str], check_interval: float = SHOTS_RELOAD_INTERVAL):
+        self.paths = paths
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._current: Optional[ShotsDataset] = None
+        self._checked_at = 0.0
+        # path -> (version, exception) of its last failed load
+        self._failed: Dict[str, tuple] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._current is not None
+
+    def _stat_versions(self) -> List[tuple]:
+        """``(path, mtime_ns, size)`` of every existing source, in order of preference."""
+        versions = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            versions.append((path, st.st_mtime_ns, st.st_size))
+        return versions
+
+    def _load(self, current: Optional[ShotsDataset]) -> tuple:
+        """(dataset, result) after loading the best source that differs from ``current``."""
+        error: Optional[Exception] = None
+        for version in self._stat_versions():
+            path = version[0]
+            if current is not None and current.version == version:
+                return current, "hit"
+            failed = self._failed.get(path)
+            if failed is not None and failed[0] == version:
+                error = failed[1]
+                if current is not None:
+                    return current, "hit"
+                continue
+            try:
+                frame = _load_shots_frame(path)
+            except Exception as e:
+                # Most likely a half-written file; retried once it changes
+                CACHE_LOOKUPS.inc(cache="dataset", result="error")
+                self._failed[path] = (version, e)
+                error = e
+                if current is not None:
+                    log.exception("reloading %s failed, keeping previous copy", path)
+                    return current, "hit"
+                log.exception("loading %s failed, trying the next source", path)
+                continue
+            self._failed.pop(path, None)
+            SHOTS_ROWS.set(len(frame))
+            SHOTS_BYTES.set(frame.nbytes)
+            return ShotsDataset(frame, version, ShotIndex(frame)), "miss"
+        # Files went away: keep serving the last good copy if we have one
+        if current is not None:
+            return current, "hit"
+        if error is not None:
+            raise error.with_traceback(None)
+        raise FileNotFoundError(f"shots data not found at {' or '.join(self.paths)}")
+
+    def get(self) -> ShotsDataset:
+        current = self._current
+        if current is not None and time.monotonic() - self._checked_at < self.check_interval:
+            CACHE_LOOKUPS.inc(cache="dataset", result="hit")
+            return current
+        # Only one thread re-checks/reloads; the others keep serving the current copy
+        if not self._lock.acquire(blocking=current is None):
+            CACHE_LOOKUPS.inc(cache="dataset", result="hit")
+            return current
+        try:
+            current, result = self._load(self._current)
+            self._current = current
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        CACHE_LOOKUPS.inc(cache="dataset", result=result)
+        return current
+
+
+_shots_cache = _ShotsCache([SHOTS_ARROW, SHOTS_STORE_MANIFEST, SHOTS_PARQUET])
+
+
+def _court_layer(data) -> alt.Chart:
+    return (
+        alt.Chart(data)
         .mark_line(color="black", strokeWidth=1)
         .encode(
             x=alt.X("x:Q", scale=alt.Scale(domain=[0, 100]), axis=None),
@@ -134,8 +379,11 @@ def _build_shot_chart_spec(df: pd.DataFrame):
         )
     )
 
-    shots_layer = (
-        alt.Chart(df)
+
+def _shots_layer(data) -> alt.Chart:
+    # Raw shot columns: court x is the shot's y and court y its x
+    return (
+        alt.Chart(data)
         .mark_circle(size=60)
         .encode(
             x=alt.X("y:Q", scale=alt.Scale(domain=[0, 100]), axis=None),
@@ -145,26 +393,265 @@ def _build_shot_chart_spec(df: pd.DataFrame):
                 scale=alt.Scale(domain=["Made", "Missed"], range=["green", "red"]),
                 legend=alt.Legend(title="Result"),
             ),
-            tooltip=["playerNameI:N", "gameid:N", "shotResult:N", "game_number:Q", "timeActual:T"],
         )
-        .transform_filter("datum.playerNameI == player_sel")
-        .transform_filter("datum.game_number >= gstart && datum.game_number < gstart + 40")
+    )
+
+
+def _build_shot_chart_spec(frame: ShotsFrame, window_size: int = SHOTS_WINDOW_SIZE):
+    alt.data_transformers.disable_max_rows()
+
+    players = frame.player_names.tolist()
+    if not players:
+        players = ["Player"]
+
+    player_dropdown = alt.binding_select(options=players, name="Player: ")
+    player_param = alt.param("player_sel", bind=player_dropdown, value=players[0])
+
+    max_games = int(frame.game_number.max()) if len(frame) else 1
+    slider_max = max(1, max_games - window_size + 1)
+    window_slider = alt.binding_range(min=1, max=slider_max, step=1, name="Start game #: ")
+    window_param = alt.param("gstart", bind=window_slider, value=1)
+
+    court_layer = _court_layer(alt.UrlData(url=COURT_URL))
+
+    # Shots are not inlined: the page loads the selected player's rows from
+    # /shots/data/<player> into this named dataset (see _SHOTS_HTML).
+    shots_layer = (
+        _shots_layer(alt.NamedData(name=SHOTS_DATASET_NAME))
+        .encode(tooltip=["playerNameI:N", "gameid:N", "shotResult:N", "game_number:Q", "timeActual:T"])
+        .transform_filter(f"datum.game_number >= gstart && datum.game_number < gstart + {window_size}")
+    )
+
+    # Hexbin view: the page swaps the raw shots for the current window's
+    # aggregated cells from /shots/density, so drawing cost doesn't grow with shots
+    shot_mode = alt.param("shot_mode", bind=alt.binding_radio(options=["points", "hexbin"], name="View: "), value="points")
+    hex_size = (2 * SHOTS_HEX_RADIUS * SHOTS_CHART_WIDTH / 100) ** 2
+    density_layer = (
+        alt.Chart(alt.NamedData(name=DENSITY_DATASET_NAME))
+        .transform_calculate(fg_pct="datum.makes / datum.attempts")
+        .mark_point(shape=HEXAGON_PATH, filled=True, opacity=0.85)
+        .encode(
+            x=alt.X("x:Q", scale=alt.Scale(domain=[0, 100]), axis=None),
+            y=alt.Y("y:Q", scale=alt.Scale(domain=[4, 50]), axis=None),
+            size=alt.Size("attempts:Q", scale=alt.Scale(range=[hex_size / 6, hex_size]), legend=None),
+            color=alt.Color("fg_pct:Q", scale=alt.Scale(scheme="redyellowgreen", domain=[0.25, 0.65], clamp=True),
+                            legend=alt.Legend(title="FG% (hexbin)", format=".0%")),
+            tooltip=[
+                alt.Tooltip("attempts:Q", title="Attempts"),
+                alt.Tooltip("makes:Q", title="Makes"),
+                alt.Tooltip("fg_pct:Q", title="FG%", format=".1%"),
+            ],
+        )
+    )
+
+    # Per-zone FG% of the current window, from /shots/zones (see _SHOTS_HTML);
+    # labels are coloured by how far they are above/below the league's rate in that zone
+    show_zones = alt.param("show_zones", bind=alt.binding_checkbox(name="Zone FG%: "), value=True)
+    zone_positions = alt.InlineData(values=[
+        {"zone": zone, "lx": x, "ly": y} for zone, (x, y) in ZONE_LABEL_POSITIONS.items()
+    ])
+    zones_layer = (
+        alt.Chart(alt.NamedData(name=ZONES_DATASET_NAME))
+        .transform_filter("show_zones && datum.start == gstart && datum.attempts > 0")
+        .transform_lookup(lookup="zone", from_=alt.LookupData(zone_positions, key="zone", fields=["lx", "ly"]))
+        .transform_calculate(
+            fg_pct="datum.makes / datum.attempts",
+            vs_league="datum.makes / datum.attempts - datum.league_fg_pct",
+            label="format(datum.makes / datum.attempts, '.0%') + ' (' + datum.makes + '/' + datum.attempts + ')'",
+        )
+        .mark_text(fontSize=13, fontWeight="bold")
+        .encode(
+            x=alt.X("lx:Q", scale=alt.Scale(domain=[0, 100]), axis=None),
+            y=alt.Y("ly:Q", scale=alt.Scale(domain=[4, 50]), axis=None),
+            text="label:N",
+            color=alt.Color("vs_league:Q", scale=alt.Scale(scheme="redblue", domain=[-0.15, 0.15]),
+                            legend=alt.Legend(title="FG% vs league", format="+.0%")),
+            tooltip=[
+                alt.Tooltip("zone:N", title="Zone"),
+                alt.Tooltip("fg_pct:Q", title="FG%", format=".1%"),
+                alt.Tooltip("league_fg_pct:Q", title="League FG%", format=".1%"),
+                alt.Tooltip("attempts:Q", title="Attempts"),
+            ],
+        )
     )
 
     chart = (
-        (court_layer + shots_layer)
-        .add_params(player_param, window_param)
-        .properties(width=700, height=400, title="Rolling 40-game Shot Chart")
+        alt.layer(court_layer, shots_layer, density_layer, zones_layer)
+        .resolve_scale(color="independent")
+        .add_params(player_param, window_param, shot_mode, show_zones)
+        .properties(width=SHOTS_CHART_WIDTH, height=SHOTS_CHART_HEIGHT, title=f"Rolling {window_size}-game Shot Chart")
         .configure_view(stroke=None)
         .configure_axis(grid=False, domain=False, ticks=False, labels=False)
     )
 
     return chart.to_dict(), slider_max
 
-@app.get("/shots")
+
+_SHOTS_HTML = """\
+<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>NBA Shot Chart</title>
+<style>
+  html, body { margin: 0; padding: 0; height: 100%; }
+  .frame-wrap { height: 100vh; width: 100%; display: flex; flex-direction: column; }
+  header { padding: 12px 16px; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; border-bottom: 1px solid #eee; }
+  header h1 { font-size: 18px; margin: 0; }
+  .controls { padding: 8px 16px; }
+  #vis { flex: 1; display: flex; align-items: center; justify-content: center; padding: 16px; }
+</style>
+
+REPLACE_SCRIPTS
+</head>
+<body>
+  <div class="frame-wrap">
+    <header>
+      <h1>NBA Shot Chart</h1>
+    </header>
+    <div class="controls">
+      <button id="play">▶ Play</button>
+      <button id="pause">❚❚ Pause</button>
+      <a id="frames" href="/shots/play">Image playback</a>
+    </div>
+    <div id="vis"></div>
+  </div>
+  <script>
+    const spec = REPLACE_SPEC;
+    const SLIDER_MAX = REPLACE_MAX;
+    const DATA_VERSION = REPLACE_VERSION;
+    const DATASET = REPLACE_DATASET;
+    const ZONES_DATASET = REPLACE_ZONES_DATASET;
+    const DENSITY_DATASET = REPLACE_DENSITY_DATASET;
+    const WINDOW_SIZE = REPLACE_WINDOW;
+    vegaEmbed('#vis', spec, {actions: false}).then((res) => {
+      const view = res.view;
+      const v = 'v=' + encodeURIComponent(DATA_VERSION);
+      const seqs = {};
+      // Replace a dataset with the rows at url (none if url is null); a newer load of the same dataset wins
+      function load(dataset, url, parse){
+        const seq = seqs[dataset] = (seqs[dataset] || 0) + 1;
+        const rows = url ? fetch(url).then((r) => r.ok ? parse(r) : []) : Promise.resolve([]);
+        rows.then((rows) => {
+          if(seqs[dataset] !== seq) return;
+          view.change(dataset, vega.changeset().remove(vega.truthy).insert(rows)).run();
+        });
+      }
+      function arrowRows(r){
+        return r.arrayBuffer().then(readArrowRows);
+      }
+      // One row per (window start, zone) from the columnar /shots/zones response
+      function zoneRows(r){
+        return r.json().then((z) => {
+          const rows = [];
+          z.starts.forEach((start, i) => {
+            z.zones.forEach((zone, j) => {
+              rows.push({start: start, zone: zone, makes: z.makes[i][j], attempts: z.attempts[i][j],
+                         league_fg_pct: z.league_fg_pct[j]});
+            });
+          });
+          return rows;
+        });
+      }
+      // One row per hexagon from the columnar /shots/density response
+      function densityRows(r){
+        return r.json().then((d) => d.x.map((x, i) => ({x: x, y: d.y[i], attempts: d.attempts[i], makes: d.makes[i]})));
+      }
+      function player(){ return encodeURIComponent(view.signal('player_sel')); }
+      function hexbin(){ return view.signal('shot_mode') === 'hexbin'; }
+      function loadDensity(){
+        const url = '/shots/density?player=' + player() + '&start=' + view.signal('gstart') + '&size=' + WINDOW_SIZE + '&' + v;
+        load(DENSITY_DATASET, hexbin() ? url : null, densityRows);
+      }
+      // Raw shots in points view, or only the current window's cells in hexbin view
+      function loadShots(){
+        load(DATASET, hexbin() ? null : '/shots/data/' + player() + '?' + v, arrowRows);
+        loadDensity();
+      }
+      function loadZones(){
+        load(ZONES_DATASET, '/shots/zones?player=' + player() + '&size=' + WINDOW_SIZE + '&' + v, zoneRows);
+      }
+      function linkFrames(){
+        document.getElementById('frames').href = '/shots/play?player=' + player() + '&size=' + WINDOW_SIZE;
+      }
+      view.addSignalListener('player_sel', () => { loadShots(); loadZones(); linkFrames(); });
+      view.addSignalListener('shot_mode', loadShots);
+      view.addSignalListener('gstart', () => { if(hexbin()) loadDensity(); });
+      loadShots();
+      loadZones();
+      linkFrames();
+      let running = false;
+      let current = 1;
+      const stepMs = 400;
+      function tick(){
+        if(!running) return;
+        current = current >= SLIDER_MAX ? 1 : current + 1;
+        view.signal('gstart', current).run();
+        setTimeout(tick, stepMs);
+      }
+      document.getElementById('play').addEventListener('click', () => {
+        if(!running){ running = true; tick(); }
+      });
+      document.getElementById('pause').addEventListener('click', () => { running = false; });
+    });
+  </script>
+</body>
+</html>
+"""
+
+
+class _ShotsPage(NamedTuple):
+    fingerprint: str
+    body: bytes
+    etag: str
+
+
+_shots_page_lock = threading.Lock()
+_shots_page: Optional[_ShotsPage] = None
+
+
+def _render_shots_page(dataset: ShotsDataset) -> _ShotsPage:
+    with STAGE_SECONDS.time(stage="chart_spec"):
+        chart_spec, slider_max = _build_shot_chart_spec(dataset.frame)
+    with STAGE_SECONDS.time(stage="json_dumps"):
+        spec_json = json.dumps(chart_spec)
+    with STAGE_SECONDS.time(stage="template"):
+        body = (
+            _SHOTS_HTML
+            .replace("REPLACE_SCRIPTS", "\n".join(f'<script src="{url}"></script>' for url in SCRIPT_URLS))
+            .replace("REPLACE_SPEC", spec_json)
+            .replace("REPLACE_MAX", json.dumps(slider_max))
+            .replace("REPLACE_VERSION", json.dumps(dataset.fingerprint))
+            .replace("REPLACE_DATASET", json.dumps(SHOTS_DATASET_NAME))
+            .replace("REPLACE_ZONES_DATASET", json.dumps(ZONES_DATASET_NAME))
+            .replace("REPLACE_DENSITY_DATASET", json.dumps(DENSITY_DATASET_NAME))
+            .replace("REPLACE_WINDOW", json.dumps(SHOTS_WINDOW_SIZE))
+        ).encode("utf-8")
+        return _ShotsPage(dataset.fingerprint, body, hashlib.sha256(body).hexdigest()[:32])
+
+
+def _get_shots_page(dataset: ShotsDataset) -> _ShotsPage:
+    """Rendered /shots HTML for ``dataset``, rebuilt only when its fingerprint changes."""
+    global _shots_page
+    page = _shots_page
+    if page is not None and page.fingerprint == dataset.fingerprint:
+        CACHE_LOOKUPS.inc(cache="page", result="hit")
+        return page
+    with _shots_page_lock:
+        page = _shots_page
+        if page is not None and page.fingerprint == dataset.fingerprint:
+            CACHE_LOOKUPS.inc(cache="page", result="hit")
+            return page
+        CACHE_LOOKUPS.inc(cache="page", result="miss")
+        page = _shots_page = _render_shots_page(dataset)
+    return page
+
+
+@bp.get("/shots")
 def shots():
     try:
-        df = _load_shots_df()
+        dataset = _shots_cache.get()
     except FileNotFoundError as e:
         return (
             f"""
@@ -175,15 +662,450 @@ def shots():
             </body></html>
             """
         ), 500
-    chart_spec, slider_max = _build_shot_chart_spec(df)
-    return (
-        """
-        <!doctype html>
-        <html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n<title>NBA Shot Chart</title>\n<style>\n  html, body { margin: 0; padding: 0; height: 100%; }\n  .frame-wrap { height: 100vh; width: 100%; display: flex; flex-direction: column; }\n  header { padding: 12px 16px; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; border-bottom: 1px solid #eee; }\n  header h1 { font-size: 18px; margin: 0; }\n  .controls { padding: 8px 16px; }\n  #vis { flex: 1; display: flex; align-items: center; justify-content: center; padding: 16px; }\n</style>\n\n<script src=\"https://cdn.jsdelivr.net/npm/vega@5\"></script>\n<script src=\"https://cdn.jsdelivr.net/npm/vega-lite@5\"></script>\n<script src=\"https://cdn.jsdelivr.net/npm/vega-embed@6\"></script>\n</head>\n<body>\n  <div class=\"frame-wrap\">\n    <header>\n      <h1>NBA Shot Chart</h1>\n    </header>\n    <div class=\"controls\">\n      <button id=\"play\">▶ Play</button>\n      <button id=\"pause\">❚❚ Pause</button>\n    </div>\n    <div id=\"vis\"></div>\n  </div>\n  <script>\n    const spec = REPLACE_SPEC;\n    const SLIDER_MAX = REPLACE_MAX;\n    vegaEmbed('#vis', spec, {actions: false}).then((res) => {\n      const view = res.view;\n      let running = false;\n      let current = 1;\n      const stepMs = 400;\n      function tick(){\n        if(!running) return;\n        current = current >= SLIDER_MAX ? 1 : current + 1;\n        view.signal('gstart', current).run();\n        setTimeout(tick, stepMs);\n      }\n      document.getElementById('play').addEventListener('click', () => {\n        if(!running){ running = true; tick(); }\n      });\n      document.getElementById('pause').addEventListener('click', () => { running = false; });\n    });\n  </script>\n</body>\n</html>
-        """
-        .replace("REPLACE_SPEC", json.dumps(chart_spec))
-        .replace("REPLACE_MAX", json.dumps(slider_max))
+    # A profiled request renders from scratch so the profile shows the real work
+    page = _render_shots_page(dataset) if g.get("profiler") is not None else _get_shots_page(dataset)
+    resp = Response(page.body, mimetype="text/html")
+    resp.set_etag(page.etag)
+    # Let browsers keep the page but revalidate every time; unchanged data -> 304
+    resp.cache_control.public = True
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
+
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+def _shots_response(frame: ShotsFrame, rows: slice) -> Response:
+    """Arrow IPC stream of ``rows`` (what the page loads), or JSON records with ?format=json."""
+    if request.args.get("format") == "json":
+        with STAGE_SECONDS.time(stage="encode_json"):
+            body = frame.to_pandas(rows)[SHOTS_DATA_COLUMNS].to_json(orient="records", date_format="iso", double_precision=2)
+        return Response(body, mimetype="application/json")
+    with STAGE_SECONDS.time(stage="encode_arrow"):
+        body = frame.to_arrow_ipc(rows)
+    return Response(body, mimetype=ARROW_STREAM_MIMETYPE)
+
+
+@bp.get("/shots/data/<path:player>")
+def shots_player_data(player: str):
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        return {"error": str(e)}, 500
+    code = dataset.frame.player_code(player)
+    if code is None:
+        return {"error": f"unknown player {player!r}"}, 404
+    resp = _shots_response(dataset.frame, dataset.index.player_slice(code))
+    return _cache_if_versioned(resp, dataset)
+
+
+def _cache_if_versioned(resp: Response, dataset: ShotsDataset) -> Response:
+    if request.args.get("v") == dataset.fingerprint:
+        # Versioned URL: the content can never change under it
+        resp.cache_control.public = True
+        resp.cache_control.max_age = 31536000
+        resp.cache_control.immutable = True
+    else:
+        resp.cache_control.no_cache = True
+    return resp
+
+
+@bp.get("/shots/window")
+def shots_window():
+    player = request.args.get("player", "")
+    try:
+        start = int(request.args.get("start", "1"))
+        size = int(request.args.get("size", str(SHOTS_WINDOW_SIZE)))
+    except ValueError:
+        return {"error": "start and size must be integers"}, 400
+    if size < 1 or start < 1:
+        return {"error": "start and size must be positive"}, 400
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        return {"error": str(e)}, 500
+    code = dataset.frame.player_code(player)
+    if code is None:
+        return {"error": f"unknown player {player!r}"}, 404
+    resp = _shots_response(dataset.frame, dataset.index.window(code, start, size))
+    return _cache_if_versioned(resp, dataset)
+
+
+@bp.get("/shots/zones")
+def shots_zones():
+    """Per-zone makes/attempts of a player's rolling windows, with league FG% per zone.
+
+    Columnar JSON: ``makes[i][j]``/``attempts[i][j]`` are zone ``zones[j]`` in the
+    window starting at game ``starts[i]``. ``start=`` narrows it to one window.
+    """
+    player = request.args.get("player", "")
+    try:
+        size = int(request.args.get("size", str(SHOTS_WINDOW_SIZE)))
+        start = int(request.args["start"]) if "start" in request.args else None
+    except ValueError:
+        return {"error": "start and size must be integers"}, 400
+    if size < 1 or (start is not None and start < 1):
+        return {"error": "start and size must be positive"}, 400
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        return {"error": str(e)}, 500
+    code = dataset.frame.player_code(player)
+    if code is None:
+        return {"error": f"unknown player {player!r}"}, 404
+    with STAGE_SECONDS.time(stage="zone_windows"):
+        starts, makes, attempts = dataset.index.zone_windows(code, size)
+        if start is not None:
+            keep = starts == start
+            starts, makes, attempts = starts[keep], makes[keep], attempts[keep]
+        league_makes, league_attempts = dataset.index.zone_totals()
+    body = {
+        "player": player,
+        "size": size,
+        "zones": list(ZONES),
+        "league_fg_pct": [round(m / a, 4) if a else None for m, a in zip(league_makes.tolist(), league_attempts.tolist())],
+        "starts": starts.tolist(),
+        "makes": makes.tolist(),
+        "attempts": attempts.tolist(),
+    }
+    return _cache_if_versioned(Response(json.dumps(body, separators=(",", ":")), mimetype="application/json"), dataset)
+
+
+_density_lock = threading.Lock()
+# (dataset fingerprint, player code, start, size) -> encoded /shots/density body, least recently used first
+_density_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+
+
+def _density_body(dataset: ShotsDataset, code: int, start: int, size: int) -> bytes:
+    """Hexbin cells of one player's window as columnar JSON, memoized per (player, window)."""
+    key = (dataset.fingerprint, code, start, size)
+    with _density_lock:
+        body = _density_cache.get(key)
+        if body is not None:
+            _density_cache.move_to_end(key)
+    if body is not None:
+        CACHE_LOOKUPS.inc(cache="density", result="hit")
+        return body
+    CACHE_LOOKUPS.inc(cache="density", result="miss")
+    frame = dataset.frame
+    rows = dataset.index.window(code, start, size)
+    scale = np.float32(frame.XY_SCALE)
+    with STAGE_SECONDS.time(stage="hexbin"):
+        # Same court coordinates as the points view; y is stretched to pixel
+        # proportions so the hexagons come out regular on screen
+        cx, cy, attempts, makes = hexbin(
+            frame.y_q[rows] / scale, frame.x_q[rows] / scale, frame.made[rows], SHOTS_HEX_RADIUS,
+            y_scale=(SHOTS_CHART_HEIGHT / 46) / (SHOTS_CHART_WIDTH / 100),
+        )
+    body = json.dumps({
+        "player": frame.player_names[code],
+        "start": start,
+        "size": size,
+        "radius": SHOTS_HEX_RADIUS,
+        "shots": int(rows.stop - rows.start),
+        "x": np.round(cx, 2).tolist(),
+        "y": np.round(cy, 2).tolist(),
+        "attempts": attempts.tolist(),
+        "makes": makes.tolist(),
+    }, separators=(",", ":")).encode("utf-8")
+    with _density_lock:
+        _density_cache[key] = body
+        while len(_density_cache) > SHOTS_DENSITY_CACHE_SIZE:
+            _density_cache.popitem(last=False)
+    return body
+
+
+@bp.get("/shots/density")
+def shots_density():
+    """A player's shots in one rolling window, aggregated into hexagons.
+
+    Columnar JSON: hexagon ``i`` is centered at ``(x[i], y[i])`` in court
+    coordinates and holds ``attempts[i]`` shots, ``makes[i]`` of them made.
+    """
+    player = request.args.get("player", "")
+    try:
+        start = int(request.args.get("start", "1"))
+        size = int(request.args.get("size", str(SHOTS_WINDOW_SIZE)))
+    except ValueError:
+        return {"error": "start and size must be integers"}, 400
+    if size < 1 or start < 1:
+        return {"error": "start and size must be positive"}, 400
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        return {"error": str(e)}, 500
+    code = dataset.frame.player_code(player)
+    if code is None:
+        return {"error": f"unknown player {player!r}"}, 404
+    body = _density_body(dataset, code, start, size)
+    return _cache_if_versioned(Response(body, mimetype="application/json"), dataset)
+
+
+_frame_cache = FrameCache(SHOTS_FRAMES_DIR, int(SHOTS_FRAMES_CACHE_MB * 1024 * 1024))
+_frame_template: Optional[tuple] = None
+
+
+def _frame_spec_template() -> tuple:
+    """(spec, digest) of a static points chart; each frame adds a title and its shots dataset."""
+    global _frame_template
+    if _frame_template is None:
+        chart = (
+            alt.layer(_court_layer(alt.NamedData(name="court")), _shots_layer(alt.NamedData(name=SHOTS_DATASET_NAME)))
+            .properties(width=SHOTS_CHART_WIDTH, height=SHOTS_CHART_HEIGHT)
+            .configure_view(stroke=None)
+        )
+        spec = chart.to_dict()
+        spec["datasets"] = {"court": json.loads(_COURT_JSON)}
+        _frame_template = (spec, frame_key(json.dumps(spec, sort_keys=True)))
+    return _frame_template
+
+
+def _render_frame(dataset: ShotsDataset, code: int, start: int, size: int, fmt: str) -> Optional[bytes]:
+    """One window of a player's chart as a PNG/SVG image, from the disk cache or rendered with vl-convert.
+
+    Returns None when the frame isn't cached and vl-convert isn't installed.
+    """
+    template, template_key = _frame_spec_template()
+    frame = dataset.frame
+    player = str(frame.player_names[code])
+    key = frame_key(dataset.fingerprint, player, start, size, fmt, SHOTS_FRAME_SCALE, template_key)
+    body = _frame_cache.get(key, fmt)
+    if body is not None:
+        CACHE_LOOKUPS.inc(cache="frame", result="hit")
+        return body
+    if vl_convert is None:
+        CACHE_LOOKUPS.inc(cache="frame", result="error")
+        return None
+    CACHE_LOOKUPS.inc(cache="frame", result="miss")
+    rows = dataset.index.window(code, start, size)
+    scale = np.float32(frame.XY_SCALE)
+    shots = [
+        {"x": x, "y": y, "shotResult": result}
+        for x, y, result in zip(
+            np.round(frame.x_q[rows] / scale, 1).tolist(),
+            np.round(frame.y_q[rows] / scale, 1).tolist(),
+            np.where(frame.made[rows], "Made", "Missed").tolist(),
+        )
+    ]
+    spec = dict(
+        template,
+        title=f"{player}: games {start}-{start + size - 1}",
+        datasets=dict(template["datasets"], **{SHOTS_DATASET_NAME: shots}),
+    )
+    with STAGE_SECONDS.time(stage="frame_render"):
+        if fmt == "png":
+            body = vl_convert.vegalite_to_png(spec, scale=SHOTS_FRAME_SCALE)
+        else:
+            body = vl_convert.vegalite_to_svg(spec).encode("utf-8")
+    _frame_cache.put(key, fmt, body)
+    return body
+
+
+@bp.get("/shots/frame")
+def shots_frame():
+    """One rolling window of a player's shot chart as an image (?format=png or svg)."""
+    player = request.args.get("player", "")
+    fmt = request.args.get("format", "png")
+    try:
+        start = int(request.args.get("start", "1"))
+        size = int(request.args.get("size", str(SHOTS_WINDOW_SIZE)))
+    except ValueError:
+        return {"error": "start and size must be integers"}, 400
+    if size < 1 or start < 1:
+        return {"error": "start and size must be positive"}, 400
+    if fmt not in FRAME_MIMETYPES:
+        return {"error": f"format must be one of {', '.join(FRAME_MIMETYPES)}"}, 400
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        return {"error": str(e)}, 500
+    code = dataset.frame.player_code(player)
+    if code is None:
+        return {"error": f"unknown player {player!r}"}, 404
+    body = _render_frame(dataset, code, start, size, fmt)
+    if body is None:
+        return {"error": "frame not rendered yet and vl-convert-python is not installed"}, 503
+    resp = Response(body, mimetype=FRAME_MIMETYPES[fmt])
+    resp.set_etag(hashlib.sha256(body).hexdigest()[:32])
+    return _cache_if_versioned(resp, dataset).make_conditional(request)
+
+
+_PLAY_HTML = """\
+<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>NBA Shot Chart: image playback</title>
+<style>
+  body { margin: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; }
+  header { padding: 12px 16px; border-bottom: 1px solid #eee; }
+  header h1 { font-size: 18px; margin: 0; }
+  .controls { padding: 8px 16px; display: flex; gap: 8px; align-items: center; }
+  #stage { padding: 16px; text-align: center; }
+  #stage img { max-width: 100%; height: auto; }
+</style>
+</head>
+<body>
+  <header>
+    <h1>NBA Shot Chart: image playback</h1>
+  </header>
+  <div class="controls">
+    <select id="player">REPLACE_OPTIONS</select>
+    <button id="play">▶ Play</button>
+    <button id="pause">❚❚ Pause</button>
+    <input id="start" type="range" min="1" value="1">
+    <span id="games"></span>
+    <a href="/shots">Interactive chart</a>
+  </div>
+  <div id="stage"><img id="frame" alt="Shot chart"></div>
+  <script>
+    const DATA_VERSION = REPLACE_VERSION;
+    const WINDOW_SIZE = REPLACE_WINDOW;
+    const FORMAT = REPLACE_FORMAT;
+    const stepMs = 400;
+    // Frames requested ahead of the one on screen; the browser keeps them (immutable URLs)
+    const PRELOAD = 8;
+    const select = document.getElementById('player');
+    const slider = document.getElementById('start');
+    const img = document.getElementById('frame');
+    let pending = new Map();
+    let running = false;
+    let current = 1;
+    function maxStart(){ return Number(select.selectedOptions[0].dataset.max); }
+    function frameUrl(start){
+      return '/shots/frame?player=' + encodeURIComponent(select.value) + '&start=' + start +
+        '&size=' + WINDOW_SIZE + '&format=' + FORMAT + '&v=' + encodeURIComponent(DATA_VERSION);
+    }
+    function preload(start){
+      for(let i = 0; i < Math.min(PRELOAD, maxStart() - 1); i++){
+        const url = frameUrl((start - 1 + i) % maxStart() + 1);
+        if(!pending.has(url)){
+          const im = new Image();
+          im.src = url;
+          pending.set(url, im);
+        }
+      }
+    }
+    function show(start){
+      current = start;
+      slider.value = start;
+      document.getElementById('games').textContent = 'Games ' + start + '-' + (start + WINDOW_SIZE - 1);
+      img.src = frameUrl(start);
+      pending.delete(frameUrl(start));
+      preload(start + 1);
+    }
+    function tick(){
+      if(!running) return;
+      const next = current >= maxStart() ? 1 : current + 1;
+      const im = pending.get(frameUrl(next));
+      // Hold the current frame until the next one has arrived instead of flashing a blank image
+      if(im && !im.complete){ setTimeout(tick, 50); return; }
+      show(next);
+      setTimeout(tick, stepMs);
+    }
+    select.addEventListener('change', () => {
+      pending = new Map();
+      slider.max = maxStart();
+      history.replaceState(null, '', '?player=' + encodeURIComponent(select.value) + '&size=' + WINDOW_SIZE);
+      show(1);
+    });
+    slider.addEventListener('input', () => show(Number(slider.value)));
+    document.getElementById('play').addEventListener('click', () => {
+      if(!running){ running = true; tick(); }
+    });
+    document.getElementById('pause').addEventListener('click', () => { running = false; });
+    slider.max = maxStart();
+    show(1);
+  </script>
+</body>
+</html>
+"""
+
+
+@bp.get("/shots/play")
+def shots_play():
+    """Playback of a player's rolling chart as pre-rendered frames: the browser only swaps images."""
+    fmt = request.args.get("format", "png")
+    try:
+        size = int(request.args.get("size", str(SHOTS_WINDOW_SIZE)))
+    except ValueError:
+        return {"error": "size must be an integer"}, 400
+    if size < 1:
+        return {"error": "size must be positive"}, 400
+    if fmt not in FRAME_MIMETYPES:
+        return {"error": f"format must be one of {', '.join(FRAME_MIMETYPES)}"}, 400
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        return {"error": str(e)}, 500
+    frame, index = dataset.frame, dataset.index
+    selected = request.args.get("player") or (str(frame.player_names[0]) if len(frame.player_names) else "")
+    options = []
+    for code, name in enumerate(frame.player_names.tolist()):
+        max_start = max(1, index.max_game(code) - size + 1)
+        options.append(
+            f'<option value="{html.escape(name)}" data-max="{max_start}"{" selected" if name == selected else ""}>'
+            f"{html.escape(name)}</option>"
         )
+    body = (
+        _PLAY_HTML
+        .replace("REPLACE_OPTIONS", "".join(options))
+        .replace("REPLACE_VERSION", json.dumps(dataset.fingerprint))
+        .replace("REPLACE_WINDOW", json.dumps(size))
+        .replace("REPLACE_FORMAT", json.dumps(fmt))
+    )
+    resp = Response(body, mimetype="text/html")
+    resp.cache_control.no_cache = True
+    return resp
+
+
+@bp.get("/healthz")
+def healthz():
+    return {"status": "ok"}
+
+
+@bp.get("/readyz")
+def readyz():
+    """200 once this process has the shots data loaded and /shots rendered, 503 before."""
+    page = _shots_page
+    if not _shots_cache.ready or page is None:
+        return {"status": "loading"}, 503
+    return {"status": "ready", "version": page.fingerprint}
+
+
+def warm() -> bool:
+    """Load the shots dataset and render /shots now instead of on the first request.
+
+    Also builds the per-row zones and the zone prefix sums behind /shots/zones,
+    so under gunicorn's preload the workers share the master's copy instead of
+    each building its own on their first zones request.
+    """
+    try:
+        dataset = _shots_cache.get()
+    except FileNotFoundError as e:
+        log.warning("not preloading shots data: %s", e)
+        return False
+    with STAGE_SECONDS.time(stage="zone_prefix"):
+        dataset.index.zone_prefix()
+    _get_shots_page(dataset)
+    return True
+
+
+def create_app(preload: bool = False) -> Flask:
+    """Build the Flask app.
+
+    With ``preload`` the shots data is loaded and the /shots page rendered
+    before returning. Under gunicorn's preload_app that happens once in the
+    master, and forked workers share those pages copy-on-write (see wsgi.py).
+    """
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(bp)
+    if preload:
+        warm()
+    return flask_app
+
+
+# Dev server / test client; production uses wsgi.py
+app = create_app()
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8000)
@@ -0,0 +1,244 @@
+"""
+Benchmark the /shots pipeline on synthetic shot logs of several sizes.
+
+Input files are generated by synth_shots.py into benchmarks/data/ on first
+use and reused afterwards. Each size runs in a fresh worker process, so the
+peak RSS numbers belong to that size alone. Stages:
+
+  load_shots_df  app._load_shots_df on the raw parquet (includes game numbering)
+  shots_frame    ShotsFrame.from_pandas + ShotIndex
+  arrow_mmap     ShotsFrame.from_arrow_file (memory-mapped) + ShotIndex
+  chart_spec     app._build_shot_chart_spec
+  court_df       app._make_court_df
+  shots_cold     GET /shots via the Flask test client with an empty cache (load + render)
+  shots_warm     GET /shots again (memoized page)
+  player_data    GET /shots/data/<player with the most shots> (Arrow IPC)
+  density_cold   GET /shots/density for that player's whole career (hexbin, empty cache)
+
+For each stage the worker records the best and median wall time over --repeat
+runs, the process's peak RSS after the stage, and the bytes produced (frame
+memory, JSON spec, or response body). Results are written as JSON to
+benchmarks/results/ along with the git commit; --compare diffs two result
+files.
+
+Usage:
+  python benchmarks/bench_shots.py                            # 10k and 1M rows
+  python benchmarks/bench_shots.py --sizes 10k 1M 10M --repeat 5   # 10M needs ~8 GB of RAM
+  python benchmarks/bench_shots.py --compare results/old.json results/new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import importlib.metadata
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_SIZES = ["10k", "1M"]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _timed(fn: Callable, repeat: int, *args, setup: Optional[Callable] = None):
+    """Run ``fn(*args)`` ``repeat`` times; returns its last result and the timing stats."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    stats = {
+        "best_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "runs": repeat,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    return result, stats
+
+
+def run_worker(path: Path, repeat: int) -> dict:
+    """Time every stage on ``path`` in this process."""
+    sys.path.insert(0, str(ROOT))
+    import numpy as np
+    import app as shots_app
+    from shots_data import ShotIndex, ShotsFrame
+
+    stages = {}
+    # Inputs are passed to _timed as arguments, not captured, so the del's below really free them
+    df, stages["load_shots_df"] = _timed(shots_app._load_shots_df, repeat, str(path))
+    stages["load_shots_df"]["bytes"] = int(df.memory_usage(deep=True).sum())
+
+    def build_frame(df):
+        frame = ShotsFrame.from_pandas(df)
+        return frame, ShotIndex(frame)
+
+    (frame, index), stages["shots_frame"] = _timed(build_frame, repeat, df)
+    stages["shots_frame"]["bytes"] = int(frame.nbytes)
+    del df
+
+    # What gunicorn workers do with a store built by scripts/build_shots_store.py
+    arrow_path = DATA_DIR / f".{path.stem}.arrow"
+    frame.to_arrow_file(str(arrow_path))
+    _, stages["arrow_mmap"] = _timed(lambda p: ShotIndex(ShotsFrame.from_arrow_file(p)), repeat, str(arrow_path))
+    stages["arrow_mmap"]["bytes"] = arrow_path.stat().st_size
+
+    (spec, _), stages["chart_spec"] = _timed(shots_app._build_shot_chart_spec, repeat, frame)
+    stages["chart_spec"]["bytes"] = len(json.dumps(spec))
+
+    court, stages["court_df"] = _timed(shots_app._make_court_df, repeat)
+    stages["court_df"]["bytes"] = len(court.to_json(orient="records"))
+    del frame, index
+
+    client = shots_app.app.test_client()
+
+    def reset_cache():
+        shots_app._shots_cache = shots_app._ShotsCache([str(path)])
+        shots_app._shots_page = None
+
+    def get(url: str):
+        resp = client.get(url)
+        assert resp.status_code == 200, (url, resp.status_code)
+        return resp
+
+    resp, stages["shots_cold"] = _timed(get, repeat, "/shots", setup=reset_cache)
+    stages["shots_cold"]["bytes"] = len(resp.data)
+    resp, stages["shots_warm"] = _timed(get, max(repeat, 20), "/shots")
+    stages["shots_warm"]["bytes"] = len(resp.data)
+
+    dataset = shots_app._shots_cache.get()
+    busiest = int(np.argmax(np.diff(dataset.index.offsets)))
+    url = f"/shots/data/{dataset.frame.player_names[busiest]}?v={dataset.fingerprint}"
+    resp, stages["player_data"] = _timed(get, max(repeat, 20), url)
+    stages["player_data"]["bytes"] = len(resp.data)
+
+    url = f"/shots/density?player={dataset.frame.player_names[busiest]}&start=1&size={dataset.index.max_game(busiest)}"
+    resp, stages["density_cold"] = _timed(get, max(repeat, 20), url, setup=shots_app._density_cache.clear)
+    stages["density_cold"]["bytes"] = len(resp.data)
+    return stages
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _versions() -> dict:
+    versions = {"python": platform.python_version()}
+    for package in ("pandas", "numpy", "pyarrow", "altair", "flask"):
+        versions[package] = importlib.metadata.version(package)
+    return versions
+
+
+def run(sizes, repeat: int, out: Optional[Path] = None, seed: int = 0) -> Path:
+    sys.path.insert(0, str(BENCH_DIR))
+    from synth_shots import parse_rows, write_shots
+
+    results = {
+        "created_at": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "platform": platform.platform(),
+        "versions": _versions(),
+        "repeat": repeat,
+        "seed": seed,
+        "sizes": {},
+    }
+    for size in sizes:
+        rows = parse_rows(size)
+        path = DATA_DIR / f"shots_{size}_seed{seed}.parquet"
+        if not path.exists():
+            print(f"Generating {path} ...", flush=True)
+            write_shots(rows, path, seed=seed)
+        print(f"Benchmarking {size} rows ...", flush=True)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", str(path), "--repeat", str(repeat)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr, file=sys.stderr)
+            results["sizes"][size] = {"rows": rows, "error": proc.stderr.strip().splitlines()[-1:]}
+            continue
+        stages = json.loads(proc.stdout.strip().splitlines()[-1])
+        results["sizes"][size] = {"rows": rows, "file_bytes": path.stat().st_size, "stages": stages}
+        for name, s in stages.items():
+            print(f"  {name:<14} best {s['best_s'] * 1000:10.2f} ms   peak RSS {s['peak_rss_mb']} MB   {s['bytes']} bytes")
+
+    if out is None:
+        stamp = _dt.datetime.now().strftime("%Y%m%dT%H%M%S")
+        out = RESULTS_DIR / f"shots-{stamp}-{results['git_commit'] or 'nogit'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"Wrote {out}")
+    return out
+
+
+def compare(old_path: Path, new_path: Path, threshold: float = 0.10) -> int:
+    """Print per-stage changes between two result files; returns the number of regressions."""
+    old, new = json.loads(old_path.read_text()), json.loads(new_path.read_text())
+    print(f"{old.get('git_commit')} -> {new.get('git_commit')}")
+    regressions = 0
+    for size, new_size in new["sizes"].items():
+        old_stages = old["sizes"].get(size, {}).get("stages")
+        if not old_stages or "stages" not in new_size:
+            continue
+        print(f"{size}:")
+        for name, n in new_size["stages"].items():
+            o = old_stages.get(name)
+            if o is None:
+                continue
+            ratio = n["best_s"] / o["best_s"] if o["best_s"] else float("inf")
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  SLOWER"
+                regressions += 1
+            elif ratio < 1 - threshold:
+                flag = "  faster"
+            print(f"  {name:<14} {o['best_s'] * 1000:10.2f} -> {n['best_s'] * 1000:10.2f} ms  x{ratio:5.2f}"
+                  f"   RSS {o['peak_rss_mb']} -> {n['peak_rss_mb']} MB   bytes {o['bytes']} -> {n['bytes']}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="*", default=DEFAULT_SIZES, help="Row counts, e.g. 10k 1M 10M")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best and median are reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--out", type=Path, help="Results file (default: benchmarks/results/shots-<time>-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"), help="Diff two results files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported by --compare")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.repeat)))
+    elif args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+    else:
+        run(args.sizes, args.repeat, out=args.out, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
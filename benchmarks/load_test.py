@@ -0,0 +1,230 @@
+"""
+HTTP load generator for the local stack (Flask, Streamlit, or both behind nginx).
+
+Runs --concurrency asyncio clients that request --paths in turn for --duration
+seconds (after a --warmup that is not counted), over one pooled httpx client.
+Reports requests/sec, p50/p95/p99/max latency and error rate per path and in
+total. Redirects are not followed, so /explorer measures Flask's 302 and not
+Streamlit. 2xx/3xx responses count as successes; 4xx/5xx and transport errors
+count as errors.
+
+Each run can be saved as JSON with a --label naming the server configuration
+(e.g. "flask-dev", "gunicorn-4w", "nginx"), and --compare prints several saved
+runs side by side.
+
+Usage:
+  python benchmarks/load_test.py                                   # Flask on :8000, /, /shots, /explorer
+  python benchmarks/load_test.py --base-url http://127.0.0.1 --paths / /shots /nba/ -c 64 -d 30
+  python benchmarks/load_test.py --paths /shots:4 / --revalidate   # weighted paths, If-None-Match
+  python benchmarks/load_test.py --label gunicorn --out results/gunicorn.json
+  python benchmarks/load_test.py --compare results/dev.json results/gunicorn.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as _dt
+import json
+import math
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+DEFAULT_PATHS = ["/", "/shots", "/explorer"]
+
+
+class Sample:
+    __slots__ = ("path", "status", "latency", "nbytes")
+
+    def __init__(self, path: str, status: Optional[int], latency: float, nbytes: int):
+        self.path = path
+        # None for transport errors and timeouts
+        self.status = status
+        self.latency = latency
+        self.nbytes = nbytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and self.status < 400
+
+
+def parse_paths(specs: Sequence[str]) -> List[str]:
+    """'/shots:3' -> ['/shots'] * 3, so heavier paths get a larger share of requests."""
+    paths: List[str] = []
+    for spec in specs:
+        path, sep, weight = spec.rpartition(":")
+        if sep and weight.isdigit() and not path.endswith(":"):
+            paths.extend([path] * int(weight))
+        else:
+            paths.append(spec)
+    return paths
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: Sequence[Sample], elapsed: float) -> dict:
+    latencies = sorted(s.latency for s in samples)
+    errors = sum(not s.ok for s in samples)
+    statuses: Dict[str, int] = defaultdict(int)
+    for s in samples:
+        statuses[str(s.status) if s.status is not None else "error"] += 1
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else float("nan"),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "bytes": sum(s.nbytes for s in samples),
+        "statuses": dict(statuses),
+    }
+
+
+async def _client(
+    client: httpx.AsyncClient,
+    paths: Sequence[str],
+    offset: int,
+    deadline: float,
+    record: bool,
+    samples: List[Sample],
+    etags: Dict[str, str],
+    revalidate: bool,
+) -> None:
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {"If-None-Match": etags[path]} if revalidate and path in etags else None
+        start = time.perf_counter()
+        try:
+            resp = await client.get(path, headers=headers)
+            status, nbytes = resp.status_code, len(resp.content)
+            if revalidate and resp.headers.get("ETag"):
+                etags[path] = resp.headers["ETag"]
+        except httpx.HTTPError:
+            status, nbytes = None, 0
+        if record:
+            samples.append(Sample(path, status, time.perf_counter() - start, nbytes))
+
+
+async def run_load(
+    base_url: str,
+    paths: Sequence[str],
+    concurrency: int = 16,
+    duration: float = 10.0,
+    warmup: float = 1.0,
+    timeout: float = 30.0,
+    revalidate: bool = False,
+    http2: bool = False,
+) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    etags: Dict[str, str] = {}
+    samples: List[Sample] = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout, http2=http2) as client:
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(
+                _client(client, paths, i, deadline, False, samples, etags, revalidate) for i in range(concurrency)
+            ))
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            _client(client, paths, i, deadline, True, samples, etags, revalidate) for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    by_path: Dict[str, List[Sample]] = defaultdict(list)
+    for s in samples:
+        by_path[s.path].append(s)
+    return {
+        "total": summarize(samples, elapsed),
+        "paths": {p: summarize(by_path[p], elapsed) for p in dict.fromkeys(paths)},
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def _print_table(rows: List[tuple]) -> None:
+    header = ("", "requests", "rps", "p50 ms", "p95 ms", "p99 ms", "max ms", "errors")
+    widths = [max(len(str(r[i])) for r in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(str(v).ljust(w) if i == 0 else str(v).rjust(w) for i, (v, w) in enumerate(zip(row, widths))))
+
+
+def _row(name: str, s: dict) -> tuple:
+    return (name, s["requests"], s["rps"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["max_ms"],
+            f"{s['error_rate'] * 100:.2f}%")
+
+
+def print_report(result: dict) -> None:
+    print(f"{result.get('label') or result['base_url']}: {result['concurrency']} clients, {result['elapsed_s']}s")
+    _print_table([_row(p, s) for p, s in result["paths"].items()] + [_row("total", result["total"])])
+
+
+def print_comparison(results: Sequence[dict]) -> None:
+    """Side-by-side totals (and per-path rows) of several saved runs."""
+    names = [r.get("label") or r["base_url"] for r in results]
+    for path in ["total"] + list(dict.fromkeys(p for r in results for p in r["paths"])):
+        print(f"{path}:")
+        rows = []
+        for name, r in zip(names, results):
+            s = r["total"] if path == "total" else r["paths"].get(path)
+            if s is not None:
+                rows.append(_row(f"{name} (c={r['concurrency']})", s))
+        _print_table(rows)
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Flask :8000, Streamlit :8501 or nginx :80")
+    parser.add_argument("--paths", nargs="*", default=DEFAULT_PATHS, help="Paths to request; '/shots:3' weights a path")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match with each path's last ETag")
+    parser.add_argument("--http2", action="store_true", help="Use HTTP/2 where the server supports it")
+    parser.add_argument("--label", help="Name of the server configuration being measured")
+    parser.add_argument("--out", type=Path, help="Save the run as JSON")
+    parser.add_argument("--compare", nargs="+", type=Path, metavar="RUN", help="Compare saved runs and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        print_comparison([json.loads(p.read_text()) for p in args.compare])
+        return
+
+    result = asyncio.run(run_load(
+        args.base_url, parse_paths(args.paths), concurrency=args.concurrency, duration=args.duration,
+        warmup=args.warmup, timeout=args.timeout, revalidate=args.revalidate, http2=args.http2,
+    ))
+    result.update({
+        "label": args.label,
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "revalidate": args.revalidate,
+        "created_at": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+    })
+    print_report(result)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2))
+        print(f"Wrote {args.out}")
+    if result["total"]["requests"] == 0:
+        sys.exit("No requests completed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Deterministic synthetic shot logs shaped like the real nba_shots parquet files.
+
+Writes the raw columns the app and scripts/build_shots_store.py read
+(playerNameI, gameid, timeActual, x, y, shotResult, Season), one row group
+per season. A season has ~450 players over 1230 games and ~220k shots, like an
+NBA regular season, so larger files span more seasons. Shot locations follow
+the app's court coordinates (court x = shot y across 0-100, court y = shot x
+from the baseline at 4) with a rim / mid-range / three-point mix and
+distance-dependent make rates.
+
+The same (rows, seed) always produces the same file.
+
+Usage:
+  python benchmarks/synth_shots.py 1M benchmarks/data/shots_1M.parquet
+  python benchmarks/synth_shots.py 10000 /tmp/shots.parquet --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SHOTS_PER_SEASON = 220_000
+PLAYERS_PER_SEASON = 450
+GAMES_PER_SEASON = 1230
+# Seasons count back from this one, so larger files reach further into the past
+LAST_SEASON = 2024
+
+SCHEMA = pa.schema([
+    ("playerNameI", pa.string()),
+    ("gameid", pa.string()),
+    ("timeActual", pa.timestamp("ns")),
+    ("x", pa.float64()),
+    ("y", pa.float64()),
+    ("shotResult", pa.string()),
+    ("Season", pa.string()),
+])
+
+# (share of shots, make probability); radius is relative to the three-point arc
+ZONES = {
+    "rim": (0.35, 0.63),
+    "mid": (0.25, 0.41),
+    "three": (0.40, 0.36),
+}
+
+
+def parse_rows(text: str) -> int:
+    """'10k' / '1M' / '10000' -> row count."""
+    text = text.strip().upper()
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _player_names(n: int) -> np.ndarray:
+    initials = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    return np.array([f"{initials[i % 26]}. Player{i:04d}" for i in range(n)])
+
+
+def _shot_locations(rng: np.random.Generator, n: int):
+    shares = np.array([z[0] for z in ZONES.values()])
+    zone = rng.choice(len(ZONES), size=n, p=shares / shares.sum())
+    radius = np.select(
+        [zone == 0, zone == 1],
+        [np.abs(rng.normal(0, 0.08, n)), rng.uniform(0.25, 0.95, n)],
+        rng.uniform(1.0, 1.15, n),
+    )
+    theta = rng.uniform(0, np.pi, n)
+    cx = np.clip(50 + 47.5 * radius * np.cos(theta), 0, 100)
+    cy = np.clip(4 + 26.65 * radius * np.sin(theta), 4, 50)
+    make_p = np.array([z[1] for z in ZONES.values()])[zone]
+    made = rng.random(n) < make_p
+    # Raw files store court y in "x" and court x in "y"
+    return cy, cx, made
+
+
+def season_frame(rng: np.random.Generator, season_idx: int, n_seasons: int, n: int, names: np.ndarray) -> pd.DataFrame:
+    start_year = LAST_SEASON - (n_seasons - 1) + season_idx
+    season = f"{start_year}-{(start_year + 1) % 100:02d}"
+    # A rolling roster: each season shares most of its players with the previous one
+    roster = (season_idx * 40 + np.arange(PLAYERS_PER_SEASON)) % len(names)
+    # Skewed usage: some players take far more shots than others
+    usage = rng.gamma(2.0, 1.0, PLAYERS_PER_SEASON)
+    player = rng.choice(roster, size=n, p=usage / usage.sum())
+    game = rng.integers(0, GAMES_PER_SEASON, n)
+    tip_off = pd.Timestamp(f"{start_year}-10-20") + pd.to_timedelta(game // 8, unit="D") + pd.Timedelta(hours=19)
+    time_actual = tip_off + pd.to_timedelta(rng.integers(0, 48 * 60, n), unit="s")
+    x, y, made = _shot_locations(rng, n)
+    return pd.DataFrame({
+        "playerNameI": names[player],
+        "gameid": np.char.add(f"002{start_year % 100:02d}", np.char.zfill(game.astype(str), 5)),
+        "timeActual": time_actual,
+        "x": x.round(1),
+        "y": y.round(1),
+        "shotResult": np.where(made, "Made", "Missed"),
+        "Season": season,
+    }).sort_values(["timeActual", "playerNameI"], kind="mergesort")
+
+
+def write_shots(rows: int, path: Path, seed: int = 0) -> Path:
+    rng = np.random.default_rng(seed)
+    n_seasons = max(1, -(-rows // SHOTS_PER_SEASON))
+    names = _player_names(PLAYERS_PER_SEASON + 40 * n_seasons)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with pq.ParquetWriter(tmp, SCHEMA, compression="zstd") as writer:
+        remaining = rows
+        for season_idx in range(n_seasons):
+            n = min(remaining, SHOTS_PER_SEASON)
+            remaining -= n
+            df = season_frame(rng, season_idx, n_seasons, n, names)
+            writer.write_table(pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False))
+    tmp.replace(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", help="Row count, e.g. 10k, 1M, 10M")
+    parser.add_argument("out", help="Output parquet path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    path = write_shots(parse_rows(args.rows), Path(args.out), seed=args.seed)
+    print(f"Wrote {path} ({path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Disk cache of rendered shot-chart frames, evicted least recently used first.
+
+Each frame is one file named after a hash of what it was rendered from, so a
+changed dataset or chart spec simply misses. Files are written atomically
+(temp file + rename), which lets several gunicorn workers share a directory.
+A hit bumps the file's mtime, and after every write the oldest files are
+removed until the directory fits the byte budget.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Formats vl-convert can render, and what they are served as
+FRAME_MIMETYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+
+def frame_key(*parts) -> str:
+    """Stable file-name-safe key for whatever ``parts`` a frame was rendered from."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+class FrameCache:
+    def __init__(self, directory: Path, budget_bytes: int):
+        self.directory = Path(directory)
+        self.budget_bytes = budget_bytes
+
+    def path(self, key: str, ext: str) -> Path:
+        return self.directory / f"{key}.{ext}"
+
+    def get(self, key: str, ext: str) -> Optional[bytes]:
+        path = self.path(key, ext)
+        try:
+            # Reads don't reliably update atime (noatime mounts), so mark use via mtime
+            os.utime(path)
+            return path.read_bytes()
+        except FileNotFoundError:  # never rendered, or just pruned by another worker
+            return None
+
+    def put(self, key: str, ext: str, body: bytes) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(key, ext)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+        self._prune(keep=path)
+        return path
+
+    def _prune(self, keep: Path) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:  # pruned by another worker
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.budget_bytes:
+                break
+            if path == str(keep):
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,67 @@
+# gunicorn -c gunicorn.conf.py wsgi:app
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:8000")
+# Workers share the preloaded dataset, so extra workers cost little memory
+workers = int(os.environ.get("WEB_CONCURRENCY", str(multiprocessing.cpu_count() + 1)))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+# Load wsgi:app (and with it the shots data) in the master before forking.
+# The listening socket is only opened after that, so nginx never reaches a
+# worker that is still loading.
+preload_app = True
+
+# Every process writes its metrics here and /metrics on any worker sums them
+# (see metrics.py). Set before the preload, since metrics.py reads it on import.
+METRICS_DIR = os.environ.setdefault(
+    "METRICS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), f"nba-viz-metrics-{bind.replace(':', '_').replace('/', '_')}"),
+)
+
+
+def on_starting(server):
+    # Counters start from zero with each server: drop a previous run's snapshots
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR)
+
+
+def when_ready(server):
+    import metrics
+
+    # The master records the preload's metrics but never serves: keep its
+    # counters (as if it had exited) and not its gauges
+    metrics.REGISTRY.write_snapshot()
+    metrics.REGISTRY.mark_process_dead(os.getpid())
+    # The preloaded objects are long-lived: move them out of the collector's
+    # reach so GC passes in workers don't write to (and un-share) their pages
+    gc.freeze()
+    server.log.info("Shots data preloaded; %d objects frozen before fork", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    import metrics
+
+    # The master's counts were already written in when_ready
+    metrics.REGISTRY.clear()
+    metrics.REGISTRY.start_flusher()
+
+
+def worker_exit(server, worker):
+    import metrics
+
+    metrics.REGISTRY.write_snapshot()
+
+
+def child_exit(server, worker):
+    import metrics
+
+    metrics.REGISTRY.mark_process_dead(worker.pid)
@@ -0,0 +1,288 @@
+"""Minimal in-process Prometheus metrics (counters, gauges, histograms).
+
+Just enough of the text exposition format for app.py's /metrics endpoint,
+without a client library dependency. Each metric keeps one value (or one
+bucket array) per label combination behind its own lock, so recording is a
+dict lookup plus a bisect.
+
+Values are per process unless METRICS_MULTIPROC_DIR is set (gunicorn.conf.py
+sets it). Then every process writes a snapshot of its values to
+``<dir>/<pid>.json`` every METRICS_FLUSH_INTERVAL seconds (and whenever it
+renders), and ``render`` merges all snapshots in the directory, so any worker
+answers /metrics for the whole server. Counters and histograms are summed;
+when a worker exits its totals are folded into ``exited.json``, so they never
+go backwards when a worker is replaced. Gauges report the largest value among
+live processes.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR") or None
+FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "2"))
+
+# Seconds; covers sub-millisecond cache hits up to multi-second cold loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Bytes, 1 KiB .. 64 MiB
+BYTE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def snapshot(self) -> dict:
+        """Copy of this process's values, keyed by label tuple."""
+        raise NotImplementedError
+
+    def merge(self, snapshots: Iterable[dict]) -> dict:
+        """Combine the snapshots of several processes into one."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self, values: Optional[dict] = None) -> List[str]:
+        raise NotImplementedError
+
+    def render(self, values: Optional[dict] = None) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples(values))
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, snapshots: Iterable[dict]) -> dict:
+        merged: Dict[Tuple[str, ...], float] = {}
+        for values in snapshots:
+            for key, value in values.items():
+                merged[key] = merged.get(key, 0.0) + value
+        return merged
+
+    def samples(self, values: Optional[dict] = None) -> List[str]:
+        items = sorted((self.snapshot() if values is None else values).items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def merge(self, snapshots: Iterable[dict]) -> dict:
+        merged: Dict[Tuple[str, ...], float] = {}
+        for values in snapshots:
+            for key, value in values.items():
+                merged[key] = max(merged.get(key, value), value)
+        return merged
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last)], sum
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {k: [list(counts), total] for k, (counts, total) in self._values.items()}
+
+    def merge(self, snapshots: Iterable[dict]) -> dict:
+        merged: Dict[Tuple[str, ...], list] = {}
+        for values in snapshots:
+            for key, (counts, total) in values.items():
+                entry = merged.get(key)
+                if entry is None:
+                    merged[key] = [list(counts), total]
+                else:
+                    entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                    entry[1] += total
+        return merged
+
+    def samples(self, values: Optional[dict] = None) -> List[str]:
+        items = sorted((self.snapshot() if values is None else values).items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self, multiproc_dir: Optional[str] = MULTIPROC_DIR):
+        self._metrics: List[_Metric] = []
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self._flusher: Optional[threading.Thread] = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        if self.multiproc_dir is None:
+            return "\n".join(m.render() for m in self._metrics) + "\n"
+        self.write_snapshot()
+        snapshots = [_read_snapshot(p) for p in self.multiproc_dir.glob("*.json")]
+        return "\n".join(
+            m.render(m.merge(s.get(m.name, {}) for s in snapshots if s is not None)) for m in self._metrics
+        ) + "\n"
+
+    def clear(self, gauges: bool = False) -> None:
+        """Zero this process's counters and histograms (and gauges with ``gauges``).
+
+        A forked worker calls this so it doesn't report again what the master
+        recorded before the fork.
+        """
+        for m in self._metrics:
+            if gauges or not isinstance(m, Gauge):
+                m.clear()
+
+    def _write(self, name: str, values: Dict[str, dict]) -> None:
+        self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+        path = self.multiproc_dir / name
+        tmp = path.with_name(f".{name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(
+            {metric: [[list(k), v] for k, v in items.items()] for metric, items in values.items()},
+            separators=(",", ":"),
+        ))
+        os.replace(tmp, path)
+
+    def write_snapshot(self) -> None:
+        """Write this process's values to ``<multiproc_dir>/<pid>.json`` (atomically)."""
+        if self.multiproc_dir is not None:
+            self._write(f"{os.getpid()}.json", {m.name: m.snapshot() for m in self._metrics})
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Fold an exited process's counters and histograms into ``exited.json``.
+
+        Its gauges are dropped; they described a process that no longer serves.
+        Called by the gunicorn master, which never records after the fork, so
+        there is a single writer.
+        """
+        if self.multiproc_dir is None:
+            return
+        path = self.multiproc_dir / f"{pid}.json"
+        dead = _read_snapshot(path)
+        if dead is None:
+            return
+        exited = _read_snapshot(self.multiproc_dir / EXITED_FILE) or {}
+        self._write(EXITED_FILE, {
+            m.name: m.merge([exited.get(m.name, {}), dead.get(m.name, {})])
+            for m in self._metrics if not isinstance(m, Gauge)
+        })
+        path.unlink()
+
+    def start_flusher(self, interval: float = FLUSH_INTERVAL) -> None:
+        """Write snapshots every ``interval`` seconds from a daemon thread (once per process)."""
+        if self.multiproc_dir is None or (self._flusher is not None and self._flusher.is_alive()):
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                self.write_snapshot()
+
+        self._flusher = threading.Thread(target=run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+
+# Counters and histograms of processes that have exited, summed
+EXITED_FILE = "exited.json"
+
+
+def _read_snapshot(path: Path) -> Optional[Dict[str, dict]]:
+    try:
+        body = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None  # removed or replaced while listing
+    return {metric: {tuple(key): value for key, value in items} for metric, items in body.items()}
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -1,17 +1,195 @@
 # --- nba_scatter_live_app.py ---
+import os
+import re
+from pathlib import Path
+from typing import List, Optional
+
 import pandas as pd
 import altair as alt
 import streamlit as st
-from nba_api.stats.endpoints import LeagueDashPlayerStats
 import numpy as np
 
+import player_stats_store as store
+import profiling
+
 # --- 1️⃣ Load NBA Data ---
-@st.cache_data
-def load_nba_data(season="2023-24"):
-    """Load NBA player statistics (per game) for selected season."""
+DATA_DIR = Path(__file__).resolve().parent / "sample_data"
+# "snapshot" (default): only the local parquet store written by scripts/fetch_snapshot*.py
+# "auto": local snapshot when present, otherwise the live NBA API
+# "live": always call the live NBA API
+DATA_SOURCE = os.environ.get("NBA_DATA_SOURCE", "snapshot").strip().lower()
+
+
+def _legacy_csv(season: str) -> Optional[Path]:
+    """Pre-parquet CSV snapshot for a season, or the bundled sample."""
+    name = season.replace("/", "-").replace(" ", "_")
+    for candidate in (f"player_stats_{name}_snapshot.csv", f"player_stats_{name.replace('-', '_')}_sample.csv"):
+        path = DATA_DIR / candidate
+        if path.exists():
+            return path
+    return None
+
+
+def available_snapshot_seasons() -> List[str]:
+    seasons = set(store.available_seasons())
+    for path in DATA_DIR.glob("player_stats_*.csv"):
+        m = re.fullmatch(r"player_stats_(\d{4})[-_](\d{2})_(?:snapshot|sample)\.csv", path.name)
+        if m:
+            seasons.add(f"{m.group(1)}-{m.group(2)}")
+    return sorted(seasons, reverse=True)
+
+
+def _in_store(season: str) -> bool:
+    """Whether the parquet store has the season, importing a legacy CSV snapshot once if needed."""
+    if store.season_path(season).exists():
+        return True
+    csv_path = _legacy_csv(season)
+    if csv_path is None:
+        return False
+    store.write_season(pd.read_csv(csv_path), season)
+    return True
+
+
+def _missing_snapshot(season: str) -> FileNotFoundError:
+    return FileNotFoundError(
+        f"No local snapshot for {season}. Run `python scripts/fetch_snapshot.py --season {season}` "
+        "or set NBA_DATA_SOURCE=auto to fall back to the live NBA API."
+    )
+
+
+def load_nba_data(season="2023-24", columns=None, team=None, source=DATA_SOURCE):
+    """Load NBA player statistics (per game) for selected season.
+
+    ``columns`` and ``team`` are pushed down to the parquet store, so only the
+    requested columns of the selected team's rows are read.
+    """
+    if source != "live":
+        if _in_store(season):
+            df = store.read_player_stats(
+                columns=columns, seasons=[season], teams=None if team is None else [team]
+            )
+            return df.drop(columns=["season"], errors="ignore")
+        if source == "snapshot":
+            raise _missing_snapshot(season)
+    # Imported lazily: only the live path needs nba_api
+    from nba_api.stats.endpoints import LeagueDashPlayerStats
     stats = LeagueDashPlayerStats(season=season, per_mode_detailed="PerGame")
     df = stats.get_data_frames()[0]
-    return df
+    if team is not None:
+        df = df[df["TEAM_ABBREVIATION"] == team]
+    return df if columns is None else df[list(columns)]
+
+
+EXCLUDED_KEYWORDS = ["RANK", "NBA_FANTASY", "WNBA_FANTASY", "_ID", "CF", "GROUP"]
+EXCLUDED_SPECIFIC = ["W", "L", "W_PCT", "BLKA", "PFD", "DD2", "TD3", "TEAM_COUNT"]
+FRIENDLY_NAMES = {
+    "AGE": "Player Age", "GP": "Games Played", "MIN": "Minutes per Game",
+    "FGM": "Field Goals Made per Game", "FGA": "Field Goals Attempted per Game",
+    "FG_PCT": "Field Goal Percentage", "FG3M": "Three-Point Field Goals Made per Game",
+    "FG3A": "Three-Point Field Goals Attempted per Game", "FG3_PCT": "Three-Point Percentage",
+    "FTM": "Free Throws Made per Game", "FTA": "Free Throws Attempted per Game",
+    "FT_PCT": "Free Throw Percentage", "OREB": "Offensive Rebounds per Game",
+    "DREB": "Defensive Rebounds per Game", "REB": "Total Rebounds per Game",
+    "AST": "Assists per Game", "STL": "Steals per Game", "BLK": "Blocks per Game",
+    "TOV": "Turnovers per Game", "PF": "Personal Fouls per Game", "PTS": "Points per Game",
+    "PLUS_MINUS": "Plus/Minus per Game",
+}
+
+
+def meaningful_columns(numeric_cols: List[str]) -> List[str]:
+    return [c for c in numeric_cols if not any(k in c for k in EXCLUDED_KEYWORDS) and c not in EXCLUDED_SPECIFIC]
+
+
+def describe_season(df: pd.DataFrame) -> dict:
+    """Axis choices for a season: the meaningful numeric columns and their display names."""
+    meaningful_cols = meaningful_columns(df.select_dtypes(include="number").columns.tolist())
+    display_to_column = {FRIENDLY_NAMES.get(c, c.replace("_", " ").title()): c for c in meaningful_cols}
+    return {"meaningful_cols": meaningful_cols, "display_to_column": display_to_column}
+
+
+def load_explorer_season(season: str, source: str = DATA_SOURCE) -> pd.DataFrame:
+    """A season with only the columns the Explorer can show.
+
+    From the parquet store that is the player and team plus the meaningful
+    numeric columns, picked from the footer before reading, so rank, ID and
+    fantasy columns are never loaded. Team filtering is done on the shared
+    frame (``SeasonData.team_rows``) rather than by re-reading per team.
+    """
+    columns = None
+    if source != "live" and _in_store(season):
+        columns = ["PLAYER_NAME", "TEAM_ABBREVIATION"] + meaningful_columns(store.numeric_columns(season))
+    return load_nba_data(season, columns=columns, source=source)
+
+
+# Memory budget for the shared season store; least recently used seasons are evicted beyond it
+STORE_BUDGET_MB = int(os.environ.get("NBA_STORE_BUDGET_MB", "256"))
+
+
+@st.cache_resource
+def get_season_store() -> store.SeasonStore:
+    """One read-only season store per process, shared by every session and rerun."""
+    return store.SeasonStore(
+        load_explorer_season,
+        budget_bytes=STORE_BUDGET_MB * 1024 * 1024,
+        max_workers=4,
+        describe=describe_season,
+    )
+
+
+# Above this many plotted rows the linked views switch to server-side aggregates
+SCATTER_MAX_POINTS = int(os.environ.get("NBA_SCATTER_MAX_POINTS", "5000"))
+STAT_BINS = 20
+
+
+def _stat_bins(stat: np.ndarray, bins: int = STAT_BINS):
+    edges = np.histogram_bin_edges(stat, bins=bins)
+    return edges, np.clip(np.searchsorted(edges, stat, side="right") - 1, 0, bins - 1)
+
+
+def _grid_cell(v: np.ndarray, n: int) -> np.ndarray:
+    lo, hi = v.min(), v.max()
+    span = hi - lo if hi > lo else 1.0
+    return np.minimum(((v - lo) / span * n).astype(np.int64), n - 1)
+
+
+def brush_view_data(df: pd.DataFrame, x_var: str, y_var: str, stat_var: str,
+                    max_points: int = SCATTER_MAX_POINTS) -> pd.DataFrame:
+    """One dataset for the three linked views, with histogram bins precomputed.
+
+    Each row carries ``stat_bin_start``/``stat_bin_end`` and a ``weight``, so the
+    browser only sums weights. Up to ``max_points`` rows this is one row per
+    player (weight 1). Beyond that, rows are grouped by (x/y grid cell, team,
+    stat bin) into one point at the group's mean x/y weighted by its size; the
+    grid is coarsened until at most ``max_points`` groups remain, so the payload
+    stays bounded whatever the row count.
+    """
+    x = df[x_var].to_numpy(dtype=np.float64)
+    y = df[y_var].to_numpy(dtype=np.float64)
+    edges, stat_bin = _stat_bins(df[stat_var].to_numpy(dtype=np.float64))
+    if len(df) <= max_points:
+        out = df.reset_index(drop=True)
+        out["stat_bin_start"], out["stat_bin_end"] = edges[stat_bin], edges[stat_bin + 1]
+        out["weight"] = 1
+        return out
+
+    team_codes, team_names = pd.factorize(df["TEAM_ABBREVIATION"])
+    n_teams, n_bins = len(team_names), len(edges) - 1
+    grid = 256
+    while True:
+        key = ((_grid_cell(x, grid) * grid + _grid_cell(y, grid)) * n_teams + team_codes) * n_bins + stat_bin
+        groups, inverse, weight = np.unique(key, return_inverse=True, return_counts=True)
+        if len(groups) <= max_points or grid <= 4:
+            break
+        grid //= 2
+    group_bin = groups % n_bins
+    return pd.DataFrame({
+        x_var: np.bincount(inverse, weights=x) / weight,
+        y_var: np.bincount(inverse, weights=y) / weight,
+        "TEAM_ABBREVIATION": np.asarray(team_names)[(groups // n_bins) % n_teams],
+        "stat_bin_start": edges[group_bin],
+        "stat_bin_end": edges[group_bin + 1],
+        "weight": weight,
+    })
 
 
 # --- 2️⃣ Streamlit UI ---
@@ -23,131 +201,205 @@ and use the dropdown below to inspect specific players’ stats.
 """)
 
 # --- 3️⃣ Season selection ---
-seasons = [f"{yr}-{str(yr+1)[-2:]}" for yr in range(2019, 2025)][::-1]
+if DATA_SOURCE == "snapshot":
+    seasons = available_snapshot_seasons()
+    if not seasons:
+        st.error("No local snapshots in sample_data/. Run `python scripts/fetch_snapshots_local.py` "
+                 "or set NBA_DATA_SOURCE=auto to use the live NBA API.")
+        st.stop()
+else:
+    seasons = [f"{yr}-{str(yr+1)[-2:]}" for yr in range(2019, 2025)][::-1]
 selected_season = st.selectbox("Select Season", seasons, index=0)
 
+season_store = get_season_store()
+
 # --- 4️⃣ Load data ---
 with st.spinner(f"Loading {selected_season} data..."):
-    df = load_nba_data(selected_season)
-st.success(f"✅ Loaded {len(df)} player records for {selected_season}.")
+    try:
+        season_data = season_store.get(selected_season)
+    except FileNotFoundError as e:
+        st.error(str(e))
+        st.stop()
+
+if DATA_SOURCE != "live" and st.session_state.get("prefetched_for") != selected_season:
+    # Once per season change, warm the neighbouring local seasons so stepping
+    # through them is instant; prefetch only fills spare budget, never evicts
+    st.session_state["prefetched_for"] = selected_season
+    local = available_snapshot_seasons()
+    if selected_season in local:
+        i = local.index(selected_season)
+        season_store.prefetch(local[max(0, i - 1):i] + local[i + 1:i + 2])
+st.success(f"✅ Loaded {len(season_data.df)} player records for {selected_season}.")
 
 # --- 5️⃣ Clean & filter numeric columns ---
-numeric_cols = df.select_dtypes(include='number').columns.tolist()
-excluded_keywords = ["RANK", "NBA_FANTASY", "WNBA_FANTASY", "_ID", "CF", "GROUP"]
-excluded_specific = ["W", "L", "W_PCT", "BLKA", "PFD", "DD2", "TD3", "TEAM_COUNT"]
-meaningful_cols = [
-    c for c in numeric_cols
-    if not any(k in c for k in excluded_keywords) and c not in excluded_specific
-]
-
-friendly_names = {
-    "AGE": "Player Age", "GP": "Games Played", "MIN": "Minutes per Game",
-    "FGM": "Field Goals Made per Game", "FGA": "Field Goals Attempted per Game",
-    "FG_PCT": "Field Goal Percentage", "FG3M": "Three-Point Field Goals Made per Game",
-    "FG3A": "Three-Point Field Goals Attempted per Game", "FG3_PCT": "Three-Point Percentage",
-    "FTM": "Free Throws Made per Game", "FTA": "Free Throws Attempted per Game",
-    "FT_PCT": "Free Throw Percentage", "OREB": "Offensive Rebounds per Game",
-    "DREB": "Defensive Rebounds per Game", "REB": "Total Rebounds per Game",
-    "AST": "Assists per Game", "STL": "Steals per Game", "BLK": "Blocks per Game",
-    "TOV": "Turnovers per Game", "PF": "Personal Fouls per Game", "PTS": "Points per Game",
-    "PLUS_MINUS": "Plus/Minus per Game",
-}
-display_to_column = {friendly_names.get(c, c.replace("_", " ").title()): c for c in meaningful_cols}
-display_names = list(display_to_column.keys())
+# Precomputed once per season by describe_season()
+display_to_column = season_data.meta["display_to_column"]
 
 # --- 6️⃣ Team Filter ---
-teams = ["All Teams"] + sorted(df["TEAM_ABBREVIATION"].unique())
+teams = ["All Teams"] + season_data.teams
 selected_team = st.selectbox("Filter by Team", teams, index=0)
+# The season frame is shared across sessions: take the team's rows by position, never modify it in place
+team_df = season_data.df
 if selected_team != "All Teams":
-    df = df[df["TEAM_ABBREVIATION"] == selected_team]
-    st.info(f"Showing {len(df)} players from {selected_team}.")
-
-# --- 7️⃣ Variable selectors ---
-x_display = st.selectbox("Select X-axis variable", display_names,
-                         index=display_names.index("Three-Point Percentage") if "Three-Point Percentage" in display_names else 0)
-y_display = st.selectbox("Select Y-axis variable", display_names,
-                         index=display_names.index("Field Goal Percentage") if "Field Goal Percentage" in display_names else 1)
-x_var, y_var = display_to_column[x_display], display_to_column[y_display]
-
-# --- 8️⃣ Prepare data ---
-df_clean = df[[x_var, y_var, "PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "AST", "REB"]].dropna()
-df_clean[x_var] = pd.to_numeric(df_clean[x_var], errors="coerce")
-df_clean[y_var] = pd.to_numeric(df_clean[y_var], errors="coerce")
-df_clean = df_clean.dropna(subset=[x_var, y_var])
-
-# --- 9️⃣ Brushing & main scatterplot ---
-brush = alt.selection_interval(encodings=['x', 'y'])
-
-scatter = (
-    alt.Chart(df_clean)
-    .mark_circle(size=70, opacity=0.7)
-    .encode(
-        x=alt.X(f"{x_var}:Q", title=x_display),
-        y=alt.Y(f"{y_var}:Q", title=y_display),
-        tooltip=["PLAYER_NAME", "TEAM_ABBREVIATION", x_var, y_var],
-        color=alt.condition(brush, alt.value("steelblue"), alt.value("lightgray")),
+    team_df = team_df.take(season_data.team_rows[selected_team])
+    st.info(f"Showing {len(team_df)} players from {selected_team}.")
+
+# Axis changes rerun only this fragment; the season load and team filter above
+# run again only when the season or team changes. Streamlit keeps the arguments
+# of the last full run, so fragment reruns reuse the same pre-filtered frame.
+def _profile_flag():
+    # ?profile=<token> in the page URL; only honoured with PROFILING_ENABLED=1 (see profiling.py)
+    return st.query_params.get("profile")
+
+
+@st.fragment
+@profiling.profiled("explorer-views", _profile_flag)
+def render_views(season_data, team_df: pd.DataFrame, display_to_column: dict, selected_season: str, selected_team: str):
+    display_names = list(display_to_column.keys())
+
+    # --- 7️⃣ Variable selectors ---
+    x_display = st.selectbox("Select X-axis variable", display_names,
+                             index=display_names.index("Three-Point Percentage") if "Three-Point Percentage" in display_names else 0)
+    y_display = st.selectbox("Select Y-axis variable", display_names,
+                             index=display_names.index("Field Goal Percentage") if "Field Goal Percentage" in display_names else 1)
+    x_var, y_var = display_to_column[x_display], display_to_column[y_display]
+
+    # --- 8️⃣ Prepare data ---
+    plot_cols = list(dict.fromkeys([x_var, y_var, "PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "AST", "REB"]))
+    df_clean = team_df[plot_cols].dropna()
+    df_clean[x_var] = pd.to_numeric(df_clean[x_var], errors="coerce")
+    df_clean[y_var] = pd.to_numeric(df_clean[y_var], errors="coerce")
+    df_clean = df_clean.dropna(subset=[x_var, y_var])
+
+    # 2️⃣ Adaptive Stat Histogram variable
+    if 'PTS' not in [x_var, y_var]:
+        stat_var, stat_title = 'PTS', 'Points per Game'
+    elif 'AST' not in [x_var, y_var]:
+        stat_var, stat_title = 'AST', 'Assists per Game'
+    else:
+        stat_var, stat_title = 'REB', 'Rebounds per Game'
+
+    # Shipped once and shared by all three views; bins and large-frame aggregation done here
+    view_df = brush_view_data(df_clean, x_var, y_var, stat_var)
+    aggregated = len(view_df) < len(df_clean)
+
+    # --- 9️⃣ Brushing & main scatterplot ---
+    brush = alt.selection_interval(encodings=['x', 'y'])
+
+    if aggregated:
+        tooltip = ["TEAM_ABBREVIATION", alt.Tooltip("weight:Q", title="Players")]
+        size = alt.Size("weight:Q", title="Players", scale=alt.Scale(range=[20, 400]))
+    else:
+        tooltip = ["PLAYER_NAME", "TEAM_ABBREVIATION"]
+        size = alt.value(70)
+    scatter = (
+        alt.Chart()
+        .mark_circle(opacity=0.7)
+        .encode(
+            x=alt.X(f"{x_var}:Q", title=x_display),
+            y=alt.Y(f"{y_var}:Q", title=y_display),
+            # Stats are stored as float32; format so tooltips don't show float noise
+            tooltip=tooltip + [alt.Tooltip(f"{x_var}:Q", format=".3~f"), alt.Tooltip(f"{y_var}:Q", format=".3~f")],
+            size=size,
+            color=alt.condition(brush, alt.value("steelblue"), alt.value("lightgray")),
+        )
+        .add_params(brush)
+        .properties(width=700, height=450,
+                    title=f"{y_display} vs {x_display} ({selected_season}{'' if selected_team == 'All Teams' else ' - ' + selected_team})")
     )
-    .add_params(brush)
-    .properties(width=700, height=450,
-                title=f"{y_display} vs {x_display} ({selected_season}{'' if selected_team == 'All Teams' else ' - ' + selected_team})")
-)
-
-# --- 🔟 Linked Views ---
-# 1️⃣ Team Composition Bar Chart (# players per team)
-team_bars = (
-    alt.Chart(df_clean)
-    .mark_bar(color='steelblue')
-    .encode(
-        y=alt.Y('TEAM_ABBREVIATION:N', sort='-x', title='Team'),
-        x=alt.X('count():Q', title='Number of Selected Players'),
-        tooltip=['TEAM_ABBREVIATION', alt.Tooltip('count():Q', title='Players Selected')]
+
+    # --- 🔟 Linked Views ---
+    # 1️⃣ Team Composition Bar Chart (# players per team)
+    team_bars = (
+        alt.Chart()
+        .mark_bar(color='steelblue')
+        .encode(
+            y=alt.Y('TEAM_ABBREVIATION:N', sort='-x', title='Team'),
+            x=alt.X('sum(weight):Q', title='Number of Selected Players'),
+            tooltip=['TEAM_ABBREVIATION', alt.Tooltip('sum(weight):Q', title='Players Selected')]
+        )
+        .transform_filter(brush)
+        .properties(width=700, height=250, title='Team Composition of Selected Players')
     )
-    .transform_filter(brush)
-    .properties(width=700, height=250, title='Team Composition of Selected Players')
-)
-
-# 2️⃣ Adaptive Stat Histogram
-if 'PTS' not in [x_var, y_var]:
-    stat_var, stat_title = 'PTS', 'Points per Game'
-elif 'AST' not in [x_var, y_var]:
-    stat_var, stat_title = 'AST', 'Assists per Game'
-else:
-    stat_var, stat_title = 'REB', 'Rebounds per Game'
-
-stat_hist = (
-    alt.Chart(df_clean)
-    .mark_bar(color='orange', opacity=0.8)
-    .encode(
-        x=alt.X(f'{stat_var}:Q', bin=alt.Bin(maxbins=20), title=stat_title),
-        y=alt.Y('count():Q', title='Number of Players'),
-        tooltip=[alt.Tooltip('count():Q', title='Players')]
+
+    # 2️⃣ Adaptive Stat Histogram (bins precomputed in brush_view_data)
+    stat_hist = (
+        alt.Chart()
+        .mark_bar(color='orange', opacity=0.8)
+        .encode(
+            x=alt.X('stat_bin_start:Q', bin='binned', title=stat_title),
+            x2='stat_bin_end:Q',
+            y=alt.Y('sum(weight):Q', title='Number of Players'),
+            tooltip=[alt.Tooltip('sum(weight):Q', title='Players')]
+        )
+        .transform_filter(brush)
+        .properties(width=700, height=250, title=f'{stat_title} Distribution of Selected Players')
     )
-    .transform_filter(brush)
-    .properties(width=700, height=250, title=f'{stat_title} Distribution of Selected Players')
-)
 
-# --- 11️⃣ Combine Charts ---
-linked_charts = scatter & team_bars & stat_hist
-st.altair_chart(linked_charts, use_container_width=True)
+    # --- 11️⃣ Combine Charts ---
+    linked_charts = alt.vconcat(scatter, team_bars, stat_hist, data=view_df)
+    st.altair_chart(linked_charts, use_container_width=True)
+    if aggregated:
+        st.caption(f"{len(df_clean)} players aggregated into {len(view_df)} weighted points "
+                   f"(NBA_SCATTER_MAX_POINTS={SCATTER_MAX_POINTS}).")
+
+    # --- 12️⃣ Table Section (Filtered Players Automatically Shown) ---
+    st.markdown("### 📋 Filtered Player Stats")
+
+    # Select relevant columns for display
+    display_cols = list(dict.fromkeys(["PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "AST", "REB", x_var, y_var]))
+    render_table(season_data, df_clean.index.to_numpy(), display_cols,
+                 (selected_season, selected_team, x_var, y_var))
+
+    st.caption(f"Showing {len(df_clean)} players for {selected_team if selected_team != 'All Teams' else 'all teams'} ({selected_season}).")
+
+
+TABLE_PAGE_SIZE = 100
+
+
+def _table_order(season_data, rows: np.ndarray, sort_col: str, key: tuple) -> np.ndarray:
+    """``rows`` in ascending ``sort_col`` order, from the season's cached argsort.
+
+    Filtered orders are memoized per session for the current (season, team, axes),
+    so flipping pages or returning to a sort column does no work proportional to
+    the number of rows.
+    """
+    cache = st.session_state.get("table_orders")
+    if cache is None or cache["key"] != key:
+        cache = st.session_state["table_orders"] = {"key": key, "orders": {}}
+    order = cache["orders"].get(sort_col)
+    if order is None:
+        member = np.zeros(len(season_data.df), dtype=bool)
+        member[rows] = True
+        full = season_data.sort_order(sort_col)
+        order = cache["orders"][sort_col] = full[member[full]]
+    return order
+
 
-# --- 12️⃣ Table Section (Filtered Players Automatically Shown) ---
-st.markdown("### 📋 Filtered Player Stats")
+# Sort and page widgets rerun only the table, not the charts
+@st.fragment
+@profiling.profiled("explorer-table", _profile_flag)
+def render_table(season_data, rows: np.ndarray, display_cols: List[str], key: tuple):
+    sort_box, dir_box, page_box = st.columns([2, 1, 1])
+    sort_col = sort_box.selectbox("Sort by", display_cols, index=display_cols.index("PTS"))
+    descending = dir_box.toggle("Descending", value=True)
+    n_pages = max(1, -(-len(rows) // TABLE_PAGE_SIZE))
+    page = page_box.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1)
 
-# Select relevant columns for display
-display_cols = ["PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "AST", "REB", x_var, y_var]
+    order = _table_order(season_data, rows, sort_col, key)
+    if descending:
+        order = order[::-1]
+    page_df = season_data.df.iloc[order[(page - 1) * TABLE_PAGE_SIZE: page * TABLE_PAGE_SIZE]][display_cols]
+    # Round only the visible page (float32 stats via float64, so 0.1 doesn't show as 0.100000001)
+    numeric = page_df.select_dtypes(include="number").columns
+    page_df[numeric] = page_df[numeric].astype(np.float64).round(2)
 
-# Sort players by Points per Game by default
-table_df = df_clean[display_cols].sort_values(by="PTS", ascending=False).reset_index(drop=True)
+    st.dataframe(page_df, use_container_width=True, hide_index=True, height=400)
 
-# Display the table
-st.dataframe(
-    table_df.style.format(precision=2),
-    use_container_width=True,
-    height=400
-)
 
-st.caption(f"Showing {len(table_df)} players for {selected_team if selected_team != 'All Teams' else 'all teams'} ({selected_season}).")
+render_views(season_data, team_df, display_to_column, selected_season, selected_team)
 
 
 # --- 13️⃣ Footer ---
-st.caption("Data Source: NBA.com Stats API (LeagueDashPlayerStats endpoint)")
\ No newline at end of file
+st.caption("Data Source: NBA.com Stats API (LeagueDashPlayerStats endpoint)"
+           + ("" if DATA_SOURCE == "live" else ", via local snapshots where available"))
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""Typed parquet store for LeagueDashPlayerStats snapshots.
+
+Layout: sample_data/player_stats/measure=<MeasureType>/season=<season>/part-0.parquet
+(hive partitioning, zstd compression). Each partition is sorted by team and
+written one row group per team, so team filters are answered from row-group
+statistics and season filters from the directory names.
+
+The schema is explicit rather than inferred: ``*_ID`` columns are int64, team
+abbreviations are dictionary-encoded, ``*_RANK`` columns are int16 and every
+other numeric stat is float32.
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+STORE_DIR = Path(__file__).resolve().parent / "sample_data" / "player_stats"
+STRING_COLUMNS = {"PLAYER_NAME", "NICKNAME"}
+CATEGORY_COLUMNS = {"TEAM_ABBREVIATION"}
+
+
+def _field(name: str, dtype) -> pa.Field:
+    if name in CATEGORY_COLUMNS:
+        return pa.field(name, pa.dictionary(pa.int8(), pa.string()))
+    if name in STRING_COLUMNS or not pd.api.types.is_numeric_dtype(dtype):
+        return pa.field(name, pa.string())
+    if name.endswith("_ID"):
+        return pa.field(name, pa.int64())
+    if name.endswith("_RANK"):
+        return pa.field(name, pa.int16())
+    return pa.field(name, pa.float32())
+
+
+def stats_schema(df: pd.DataFrame) -> pa.Schema:
+    return pa.schema([_field(c, df[c].dtype) for c in df.columns])
+
+
+def season_path(season: str, measure_type: str = "Base", store_dir: Path = STORE_DIR) -> Path:
+    season = season.replace("/", "-").replace(" ", "_")
+    return store_dir / f"measure={measure_type}" / f"season={season}" / "part-0.parquet"
+
+
+def season_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Encode one season's frame with the store schema (deterministic for equal input)."""
+    schema = stats_schema(df)
+    df = df.sort_values("TEAM_ABBREVIATION", kind="mergesort") if "TEAM_ABBREVIATION" in df.columns else df
+    sink = pa.BufferOutputStream()
+    with pq.ParquetWriter(sink, schema, compression="zstd", write_statistics=True) as writer:
+        groups = df.groupby("TEAM_ABBREVIATION", sort=False) if "TEAM_ABBREVIATION" in df.columns else [(None, df)]
+        for _, group in groups:
+            writer.write_table(pa.Table.from_pandas(group, schema=schema, preserve_index=False))
+    return sink.getvalue().to_pybytes()
+
+
+def write_season(df: pd.DataFrame, season: str, measure_type: str = "Base", store_dir: Path = STORE_DIR) -> Path:
+    path = season_path(season, measure_type, store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = season_parquet_bytes(df)
+    # Unique temp name: sessions importing the same legacy CSV at once must not
+    # write into each other's file. The leading dot keeps it out of the dataset.
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as f:
+        f.write(body)
+    try:
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    return path
+
+
+def _dataset(measure_type: str, store_dir: Path) -> Optional[ds.Dataset]:
+    root = store_dir / f"measure={measure_type}"
+    if not root.exists():
+        return None
+    return ds.dataset(root, format="parquet", partitioning="hive")
+
+
+def available_seasons(measure_type: str = "Base", store_dir: Path = STORE_DIR) -> List[str]:
+    root = store_dir / f"measure={measure_type}"
+    if not root.exists():
+        return []
+    return sorted((p.parent.name.split("=", 1)[1] for p in root.glob("season=*/part-0.parquet")), reverse=True)
+
+
+def season_schema(season: str, measure_type: str = "Base", store_dir: Path = STORE_DIR) -> Optional[pa.Schema]:
+    """Schema of one season's partition (reads only the parquet footer)."""
+    path = season_path(season, measure_type, store_dir)
+    return pq.read_schema(path) if path.exists() else None
+
+
+def numeric_columns(season: str, measure_type: str = "Base", store_dir: Path = STORE_DIR) -> List[str]:
+    schema = season_schema(season, measure_type, store_dir)
+    if schema is None:
+        return []
+    return [f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)]
+
+
+def read_player_stats(
+    columns: Optional[Iterable[str]] = None,
+    seasons: Optional[Iterable[str]] = None,
+    teams: Optional[Iterable[str]] = None,
+    measure_type: str = "Base",
+    store_dir: Path = STORE_DIR,
+) -> pd.DataFrame:
+    """Read only ``columns`` of the rows matching ``seasons``/``teams``.
+
+    Season filters prune partitions; team filters are pushed down to the
+    per-team row groups. ``season`` is available as a column.
+    """
+    dataset = _dataset(measure_type, store_dir)
+    if dataset is None:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    expr = None
+    if seasons is not None:
+        expr = ds.field("season").isin(list(seasons))
+    if teams is not None:
+        team_expr = ds.field("TEAM_ABBREVIATION").isin(list(teams))
+        expr = team_expr if expr is None else expr & team_expr
+    table = dataset.to_table(columns=list(columns) if columns is not None else None, filter=expr)
+    return table.to_pandas()
+
+
+class SeasonData(NamedTuple):
+    """One season, loaded once and shared read-only by every session."""
+    season: str
+    df: pd.DataFrame
+    numeric_cols: List[str]
+    teams: List[str]
+    # Row positions of each team's players in ``df`` (use ``df.take``)
+    team_rows: Dict[str, np.ndarray]
+    # Extra per-season metadata computed by the store's ``describe`` callback
+    meta: dict
+    nbytes: int
+    # Filled lazily by ``sort_order``
+    orders: Dict[str, np.ndarray]
+
+    def sort_order(self, column: str) -> np.ndarray:
+        """Row positions of ``df`` sorted ascending by ``column``, computed once per season."""
+        order = self.orders.get(column)
+        if order is None:
+            order = self.orders[column] = np.argsort(self.df[column].to_numpy(), kind="stable")
+        return order
+
+
+class SeasonStore:
+    """Process-wide cache of whole seasons with a memory budget.
+
+    Seasons are loaded by ``loader`` on a thread pool (``prefetch`` loads
+    several in parallel; concurrent ``get`` calls for the same season share one
+    load). Once loaded, a season's frame, numeric columns, team index and
+    ``describe(df)`` metadata are kept until the total size exceeds
+    ``budget_bytes``, at which point the least recently used seasons are
+    evicted. The most recently loaded season is always kept.
+
+    Prefetched seasons only use spare budget: one that doesn't fit is
+    dropped instead of evicting anything, and one that does is kept as the
+    least recently used until a ``get`` asks for it.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], pd.DataFrame],
+        budget_bytes: int = 256 * 1024 * 1024,
+        max_workers: int = 4,
+        describe: Optional[Callable[[pd.DataFrame], dict]] = None,
+    ):
+        self.loader = loader
+        self.budget_bytes = budget_bytes
+        self.describe = describe
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="season-store")
+        self._lock = threading.RLock()
+        self._seasons: "OrderedDict[str, SeasonData]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        # Pending seasons that a get() is waiting for (the rest are only prefetched)
+        self._wanted: set = set()
+
+    def _build(self, season: str) -> SeasonData:
+        # Positions and index labels coincide, so callers can use either
+        df = self.loader(season).reset_index(drop=True)
+        team_rows = {}
+        if "TEAM_ABBREVIATION" in df.columns:
+            team_rows = {str(t): rows for t, rows in df.groupby("TEAM_ABBREVIATION", observed=True).indices.items()}
+        data = SeasonData(
+            season=season,
+            df=df,
+            numeric_cols=df.select_dtypes(include="number").columns.tolist(),
+            teams=sorted(team_rows),
+            team_rows=team_rows,
+            meta=self.describe(df) if self.describe is not None else {},
+            nbytes=int(df.memory_usage(deep=True).sum()),
+            orders={},
+        )
+        with self._lock:
+            self._pending.pop(season, None)
+            if season in self._wanted:
+                self._wanted.discard(season)
+                self._seasons[season] = data
+                self._seasons.move_to_end(season)
+                self._evict(keep=season)
+            elif sum(d.nbytes for d in self._seasons.values()) + data.nbytes <= self.budget_bytes:
+                self._seasons[season] = data
+                self._seasons.move_to_end(season, last=False)
+        return data
+
+    def _evict(self, keep: str) -> None:
+        total = sum(d.nbytes for d in self._seasons.values())
+        for season in list(self._seasons):
+            if total <= self.budget_bytes:
+                break
+            if season != keep:
+                total -= self._seasons.pop(season).nbytes
+
+    def _submit(self, season: str) -> Future:
+        # Caller holds self._lock
+        future = self._pending.get(season)
+        if future is None:
+            future = self._executor.submit(self._build, season)
+            self._pending[season] = future
+            # May run right here if the load already failed, hence the RLock
+            future.add_done_callback(lambda f, s=season: self._forget_failed(s, f))
+        return future
+
+    def _forget_failed(self, season: str, future: Future) -> None:
+        if future.exception() is not None:
+            with self._lock:
+                if self._pending.get(season) is future:
+                    del self._pending[season]
+                    self._wanted.discard(season)
+
+    def prefetch(self, seasons: Iterable[str]) -> None:
+        """Start loading ``seasons`` in the background (at most ``max_workers`` at a time).
+
+        They are kept only if they fit in the budget next to the seasons already loaded.
+        """
+        with self._lock:
+            for season in seasons:
+                if season not in self._seasons:
+                    self._submit(season)
+
+    def get(self, season: str) -> SeasonData:
+        with self._lock:
+            data = self._seasons.get(season)
+            if data is not None:
+                self._seasons.move_to_end(season)
+                return data
+            self._wanted.add(season)
+            future = self._submit(season)
+        return future.result()
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(d.nbytes for d in self._seasons.values())
@@ -0,0 +1,162 @@
+"""Opt-in sampling profiler for single Flask requests and Streamlit reruns.
+
+Off unless PROFILING_ENABLED=1 and a PROFILE_TOKEN is set. When enabled, a
+request (or rerun) asks to be profiled with ``profile=<token>`` in the query
+string or an ``X-Profile: <token>`` header; without a configured token nothing
+is ever profiled, so anonymous clients can't trigger full renders and disk
+writes. A background thread then samples the handling thread's stack
+every PROFILE_INTERVAL_MS milliseconds (default 5) and the result is written
+to PROFILE_DIR (default ./profiles) as folded stacks, one ``frame;frame;...
+count`` line per distinct stack, which flamegraph.pl, speedscope and inferno
+read directly. Only the newest PROFILE_KEEP files (default 50) are kept.
+
+Sampling never blocks the profiled thread, so overhead is limited to the
+sampler itself, and nothing runs at all unless a request opts in.
+"""
+
+import datetime as _dt
+import hmac
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", Path(__file__).resolve().parent / "profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_HEADER = "X-Profile"
+
+_ROOT = str(Path(__file__).resolve().parent)
+_active = threading.local()
+
+
+def requested(flag: Optional[str]) -> bool:
+    """Whether a request carrying ``flag`` (query/header value) should be profiled."""
+    if not PROFILING_ENABLED or not PROFILE_TOKEN or not flag:
+        return False
+    # Compare bytes: compare_digest rejects str arguments with non-ASCII characters
+    return hmac.compare_digest(flag.encode("utf-8", "surrogatepass"), PROFILE_TOKEN.encode("utf-8", "surrogatepass"))
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if path.startswith(_ROOT):
+        path = os.path.relpath(path, _ROOT)
+    else:
+        path = os.path.basename(path)
+    # Semicolons separate frames in the folded format
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """Samples one thread's call stack at a fixed interval from a background thread."""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._started = None
+        self.elapsed = 0.0
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._started = _dt.datetime.now()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = (_dt.datetime.now() - self._started).total_seconds()
+
+    def folded(self) -> str:
+        labels = {}
+        lines = []
+        for stack, count in self.stacks.most_common():
+            names = []
+            for code in stack:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                names.append(label)
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _prune(directory: Path, keep: int) -> None:
+    files = sorted(directory.glob("*.folded"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[keep:]:
+        try:
+            old.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def write_profile(profiler: SamplingProfiler, name: str, directory: Path = PROFILE_DIR, keep: int = PROFILE_KEEP) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = _dt.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "profile"
+    path = directory / f"{stamp}-{slug}-{int(profiler.elapsed * 1000)}ms.folded"
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(profiler.folded())
+    os.replace(tmp, path)
+    _prune(directory, keep)
+    return path
+
+
+def start() -> Optional[SamplingProfiler]:
+    """Start profiling the current thread, unless it is already being profiled."""
+    if getattr(_active, "profiler", None) is not None:
+        return None
+    _active.profiler = SamplingProfiler().start()
+    return _active.profiler
+
+
+def finish(profiler: Optional[SamplingProfiler], name: str) -> Optional[Path]:
+    if profiler is None:
+        return None
+    profiler.stop()
+    _active.profiler = None
+    return write_profile(profiler, name)
+
+
+@contextmanager
+def profile(name: str, flag: Optional[str]):
+    """Profile the enclosed block if ``flag`` requests it; yields the profiler or None."""
+    profiler = start() if requested(flag) else None
+    try:
+        yield profiler
+    finally:
+        finish(profiler, name)
+
+
+def profiled(name: str, flag: Callable[[], Optional[str]]):
+    """Decorator form of ``profile``; ``flag`` is called on each invocation."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile(name, flag()):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,204 @@
+"""
+Build the enriched shots store read by the Flask /shots endpoints.
+
+Turns raw shots parquet files (playerNameI, gameid, timeActual, x, y, shotResult,
+Season) into sample_data/shots_store/Season=<season>/part-0.parquet with
+game_number materialized. Each partition is sorted by (playerNameI, game_number)
+and written one row group per player, so row-group statistics on playerNameI
+let readers skip straight to a player.
+
+After each rebuild the whole store is also written to _shots.arrow, the
+compact ShotsFrame columns as one uncompressed Arrow IPC file. The app
+memory-maps that file, so gunicorn workers share one copy of the data.
+
+game_number counts a player's games across all seasons, so rebuilding a season
+also rebuilds every later one. Rebuilds are incremental: _manifest.json records
+the source files' mtime/size and per-season game counts, and only seasons whose
+sources changed (plus the seasons after them) are rewritten.
+
+Usage:
+  python scripts/build_shots_store.py                          # sample_data/nba_shots_min.parquet
+  python scripts/build_shots_store.py --src raw_shots/         # every *.parquet in a directory
+  python scripts/build_shots_store.py --src 2023-24.parquet 2024-25.parquet --full
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shots_data import ShotsFrame, add_game_number  # noqa: E402
+
+RAW_COLUMNS = ["playerNameI", "gameid", "timeActual", "x", "y", "shotResult", "Season"]
+STORE_SCHEMA = pa.schema([
+    ("playerNameI", pa.string()),
+    ("gameid", pa.string()),
+    ("timeActual", pa.timestamp("ns")),
+    ("x", pa.float64()),
+    ("y", pa.float64()),
+    ("shotResult", pa.string()),
+    ("game_number", pa.int32()),
+])
+MANIFEST_NAME = "_manifest.json"
+# Leading underscore: parquet readers of the store directory skip it
+ARROW_NAME = "_shots.arrow"
+
+
+def list_sources(paths: List[str]) -> List[Path]:
+    sources: List[Path] = []
+    for p in paths:
+        path = Path(p).resolve()
+        if path.is_dir():
+            sources.extend(sorted(path.glob("*.parquet")))
+        else:
+            sources.append(path)
+    return sources
+
+
+def load_manifest(out_dir: Path) -> dict:
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"sources": {}, "seasons": {}}
+    return json.loads(path.read_text())
+
+
+def write_manifest(out_dir: Path, manifest: dict) -> None:
+    # Written last and atomically: the app reloads when this file changes
+    tmp = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+
+
+def _file_stamp(path: Path) -> dict:
+    st = path.stat()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _source_seasons(path: Path) -> List[str]:
+    seasons = pq.read_table(path, columns=["Season"]).column("Season").unique().to_pylist()
+    return sorted(str(s) for s in seasons if s is not None)
+
+
+def write_season(out_dir: Path, season: str, df: pd.DataFrame) -> None:
+    """Write one season partition, one row group per player, replacing it atomically."""
+    part_dir = out_dir / f"Season={season}"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    tmp = part_dir / ".part-0.parquet.tmp"
+    df = df.sort_values(["playerNameI", "game_number"], kind="mergesort")
+    with pq.ParquetWriter(tmp, STORE_SCHEMA, compression="zstd", write_statistics=True) as writer:
+        for _, group in df.groupby("playerNameI", sort=False):
+            writer.write_table(pa.Table.from_pandas(group[STORE_SCHEMA.names], schema=STORE_SCHEMA, preserve_index=False))
+    os.replace(tmp, part_dir / "part-0.parquet")
+
+
+def write_arrow(out_dir: Path) -> None:
+    """Write the mappable ShotsFrame file for every season in the store."""
+    df = pd.read_parquet(out_dir, columns=STORE_SCHEMA.names + ["Season"])
+    ShotsFrame.from_pandas(df).to_arrow_file(str(out_dir / ARROW_NAME))
+
+
+def build_store(sources: List[Path], out_dir: Path, full: bool = False) -> List[str]:
+    """Rebuild the seasons whose sources changed; returns the seasons written."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"sources": {}, "seasons": {}} if full else load_manifest(out_dir)
+    old_sources: Dict[str, dict] = manifest["sources"]
+
+    new_sources: Dict[str, dict] = {}
+    dirty = set()
+    for path in sources:
+        stamp = _file_stamp(path)
+        old = old_sources.get(str(path))
+        if old is not None and old["mtime_ns"] == stamp["mtime_ns"] and old["size"] == stamp["size"]:
+            stamp["seasons"] = old["seasons"]
+        else:
+            stamp["seasons"] = _source_seasons(path)
+            dirty.update(stamp["seasons"])
+            if old is not None:
+                dirty.update(old["seasons"])
+        new_sources[str(path)] = stamp
+    for path, old in old_sources.items():
+        if path not in new_sources:
+            dirty.update(old["seasons"])
+
+    all_seasons = sorted({s for stamp in new_sources.values() for s in stamp["seasons"]})
+    dirty |= set(all_seasons) - set(manifest["seasons"])
+    if not dirty:
+        if not (out_dir / ARROW_NAME).exists():
+            write_arrow(out_dir)
+        return []
+    first_dirty = min(dirty)
+
+    # Games already numbered per player in the untouched, earlier seasons
+    base_counts: Dict[str, int] = {}
+    for season in all_seasons:
+        if season >= first_dirty:
+            break
+        for player, n in manifest["seasons"][season]["games_per_player"].items():
+            base_counts[player] = base_counts.get(player, 0) + n
+
+    seasons_meta = {s: m for s, m in manifest["seasons"].items() if s < first_dirty and s in all_seasons}
+    written: List[str] = []
+    for season in (s for s in all_seasons if s >= first_dirty):
+        parts = [
+            pd.read_parquet(path, columns=RAW_COLUMNS, filters=[("Season", "==", season)])
+            for path, stamp in new_sources.items()
+            if season in stamp["seasons"]
+        ]
+        df = pd.concat(parts, ignore_index=True)
+        df["timeActual"] = pd.to_datetime(df["timeActual"])
+        df = add_game_number(df.drop(columns=["Season"]), base_counts)
+        # Shots without a timestamp can't be placed in any game window
+        df = df.dropna(subset=["game_number"])
+        write_season(out_dir, season, df)
+
+        games = df.drop_duplicates(["playerNameI", "gameid"]).groupby("playerNameI").size()
+        games_per_player = {str(p): int(n) for p, n in games.items()}
+        for player, n in games_per_player.items():
+            base_counts[player] = base_counts.get(player, 0) + n
+        seasons_meta[season] = {
+            "rows": int(len(df)),
+            "games_per_player": games_per_player,
+            "built_at": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+        }
+        written.append(season)
+
+    # Drop partitions of seasons that no longer have a source
+    for part_dir in out_dir.glob("Season=*"):
+        if part_dir.name.split("=", 1)[1] not in all_seasons:
+            shutil.rmtree(part_dir)
+
+    write_arrow(out_dir)
+    write_manifest(out_dir, {"sources": new_sources, "seasons": seasons_meta})
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--src", nargs="*", default=[str(ROOT / "sample_data" / "nba_shots_min.parquet")],
+                        help="Raw shots parquet files or directories of them")
+    parser.add_argument("--out", default=str(ROOT / "sample_data" / "shots_store"))
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and rebuild every season")
+    args = parser.parse_args()
+
+    written = build_store(list_sources(args.src), Path(args.out), full=args.full)
+    if written:
+        print("Rebuilt seasons:", ", ".join(written))
+    else:
+        print("Store is up to date.")
+
+
+if __name__ == "__main__":
+    main()
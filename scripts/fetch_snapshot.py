@@ -1,8 +1,15 @@
 import argparse
+import datetime as _dt
+import sys
 from pathlib import Path
 import httpx
 import pandas as pd
 
+from snapshot_manifest import DEFAULT_TTL, SnapshotManifest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from player_stats_store import season_parquet_bytes, season_path  # noqa: E402
+
 NBA_REQUEST_HEADERS = {
     "Host": "stats.nba.com",
     "Connection": "keep-alive",
@@ -21,7 +28,7 @@ NBA_REQUEST_HEADERS = {
 }
 
 
-def fetch_to_csv(season: str) -> Path:
+def fetch_to_parquet(season: str, force: bool = False, ttl: _dt.timedelta = DEFAULT_TTL) -> Path:
     url = "https://stats.nba.com/stats/leaguedashplayerstats"
     params = {
         "LeagueID": "00",
@@ -30,6 +37,13 @@ def fetch_to_csv(season: str) -> Path:
         "SeasonType": "Regular Season",
         "MeasureType": "Base",
     }
+    out_dir = Path(__file__).resolve().parents[1] / "sample_data"
+    out_file = season_path(season, "Base", out_dir / "player_stats")
+    manifest = SnapshotManifest(out_dir)
+    if not manifest.needs_fetch(out_file, season, params, ttl=ttl, force=force):
+        print(f"Up to date: {out_file}")
+        return out_file
+
     with httpx.Client(http2=True, headers=NBA_REQUEST_HEADERS, timeout=20) as client:
         resp = client.get(url, params=params)
         resp.raise_for_status()
@@ -40,19 +54,20 @@ def fetch_to_csv(season: str) -> Path:
         rows = result[0]["rowSet"]
         df = pd.DataFrame(rows, columns=cols)
 
-    out_dir = Path(__file__).resolve().parents[1] / "sample_data"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_file = out_dir / f"player_stats_{season.replace('/', '-').replace(' ', '_')}_snapshot.csv"
-    df.to_csv(out_file, index=False)
+    manifest.record(out_file, season, params, season_parquet_bytes(df), len(df))
+    manifest.save()
     return out_file
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", default="2023-24")
+    parser.add_argument("--force", action="store_true", help="Fetch even if the snapshot is up to date")
+    parser.add_argument("--ttl-hours", type=float, default=DEFAULT_TTL.total_seconds() / 3600,
+                        help="Re-fetch the current season only after this many hours")
     args = parser.parse_args()
-    path = fetch_to_csv(args.season)
-    print(f"Wrote {path}")
+    path = fetch_to_parquet(args.season, force=args.force, ttl=_dt.timedelta(hours=args.ttl_hours))
+    print(f"Snapshot: {path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+"""
+Fetch player-stat snapshots for many seasons and measure types concurrently.
+
+All requests share one pooled httpx.AsyncClient (HTTP/2 where the server
+supports it). A semaphore bounds the number of requests in flight, a token
+bucket caps the request rate, and transient failures (timeouts, connection
+errors, 429/5xx) are retried with jittered exponential backoff. A request
+waiting to retry gives up its slot, so it doesn't stall the other fetches.
+
+Snapshots go to the parquet store under sample_data/player_stats/, partitioned by
+measure type and season (see player_stats_store.py). Snapshots that are still fresh
+according to sample_data/snapshots_manifest.json are not requested at all
+(see snapshot_manifest.py).
+
+Usage:
+  python scripts/fetch_snapshots_async.py                                # last 5 seasons, Base
+  python scripts/fetch_snapshots_async.py --seasons 2022-23 2023-24 --measures Base Advanced
+  python scripts/fetch_snapshots_async.py --base-url http://127.0.0.1:9000/stats/leaguedashplayerstats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as _dt
+import random
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import httpx
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# Sibling scripts, so this also imports when run or imported from outside scripts/
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fetch_snapshots_local import (  # noqa: E402
+    LEAGUE_DASH_URL,
+    NBA_REQUEST_HEADERS,
+    generate_last_n_seasons,
+    league_dash_params,
+)
+from player_stats_store import season_parquet_bytes, season_path  # noqa: E402
+from snapshot_manifest import DEFAULT_TTL, SnapshotManifest  # noqa: E402
+
+# Statuses worth retrying; anything else (e.g. 400/404) fails immediately
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allow ``rate`` requests per second on average, with bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def snapshot_path(out_dir: Path, season: str, measure_type: str = "Base") -> Path:
+    return season_path(season, measure_type, out_dir / "player_stats")
+
+
+def result_set_to_frame(data: dict) -> pd.DataFrame:
+    result_sets = data.get("resultSets") or [data.get("resultSet")]
+    result_sets = [r for r in result_sets if r]
+    return pd.DataFrame(result_sets[0]["rowSet"], columns=result_sets[0]["headers"])
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    try:
+        return float(resp.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0
+
+
+async def fetch_frame(
+    client: httpx.AsyncClient,
+    limiter: TokenBucket,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    season: str,
+    measure_type: str = "Base",
+    retries: int = 4,
+    backoff: float = 1.0,
+) -> pd.DataFrame:
+    params = league_dash_params(season, measure_type)
+    for attempt in range(retries + 1):
+        delay = backoff * 2 ** attempt * (1 + random.random() * 0.25)
+        # Hold a concurrency slot only while a request is in flight, not while backing off
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                resp = await client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+                resp = None
+        if resp is not None:
+            if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                resp.raise_for_status()
+                return result_set_to_frame(resp.json())
+            delay = max(delay, _retry_after(resp))
+        await asyncio.sleep(delay)
+
+
+async def fetch_all(
+    seasons: Sequence[str],
+    measure_types: Sequence[str],
+    out_dir: Path,
+    url: str = LEAGUE_DASH_URL,
+    concurrency: int = 4,
+    rate: float = 2.0,
+    retries: int = 4,
+    backoff: float = 1.0,
+    timeout: float = 25.0,
+    force: bool = False,
+    ttl: _dt.timedelta = DEFAULT_TTL,
+) -> List[Path]:
+    """Fetch every stale (season, measure type) snapshot into the store under ``out_dir``.
+
+    Returns the partition paths that were fetched.
+
+    Failures are reported after all other fetches finish; the first one is re-raised.
+    """
+    headers = {k: v for k, v in NBA_REQUEST_HEADERS.items() if k not in ("Host", "Connection")}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    limiter = TokenBucket(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    manifest = SnapshotManifest(out_dir)
+    jobs = [
+        (s, m) for s in seasons for m in measure_types
+        if manifest.needs_fetch(snapshot_path(out_dir, s, m), s, league_dash_params(s, m), ttl=ttl, force=force)
+    ]
+    if not jobs:
+        return []
+
+    async with httpx.AsyncClient(http2=True, headers=headers, limits=limits, timeout=timeout) as client:
+        results = await asyncio.gather(
+            *(fetch_frame(client, limiter, semaphore, url, s, m, retries, backoff) for s, m in jobs),
+            return_exceptions=True,
+        )
+
+    written: List[Path] = []
+    errors = []
+    for (season, measure_type), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            errors.append((season, measure_type, result))
+            continue
+        path = snapshot_path(out_dir, season, measure_type)
+        manifest.record(path, season, league_dash_params(season, measure_type), season_parquet_bytes(result), len(result))
+        written.append(path)
+    manifest.save()
+    for season, measure_type, exc in errors:
+        print(f"Failed {season} {measure_type}: {exc!r}")
+    if errors:
+        raise errors[0][2]
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seasons", nargs="*", help="Explicit seasons like 2021-22 2022-23")
+    parser.add_argument("--measures", nargs="*", default=["Base"], help="MeasureType values, e.g. Base Advanced")
+    parser.add_argument("--base-url", default=LEAGUE_DASH_URL, help="Endpoint URL (point at a local stand-in to test)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max requests in flight")
+    parser.add_argument("--rate", type=float, default=2.0, help="Max requests per second")
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--backoff", type=float, default=1.0, help="First retry delay in seconds (doubles each retry)")
+    parser.add_argument("--force", action="store_true", help="Fetch even if snapshots are up to date")
+    parser.add_argument("--ttl-hours", type=float, default=DEFAULT_TTL.total_seconds() / 3600,
+                        help="Re-fetch the current season only after this many hours")
+    args = parser.parse_args()
+
+    seasons = args.seasons or generate_last_n_seasons(5)
+    out_dir = Path(__file__).resolve().parents[1] / "sample_data"
+    written = asyncio.run(fetch_all(
+        seasons, args.measures, out_dir, url=args.base_url, concurrency=args.concurrency,
+        rate=args.rate, retries=args.retries, backoff=args.backoff,
+        force=args.force, ttl=_dt.timedelta(hours=args.ttl_hours),
+    ))
+    print("Fetched:" if written else "All snapshots up to date.")
+    for p in written:
+        print(" -", p)
+
+
+if __name__ == "__main__":
+    main()
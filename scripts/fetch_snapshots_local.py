@@ -1,10 +1,15 @@
 """
-Fetch snapshots for recent NBA seasons using nba_api and write CSVs into sample_data/.
+Fetch snapshots for recent NBA seasons and write them into the parquet store
+under sample_data/player_stats/ (see player_stats_store.py).
 
 Designed to run on your Mac without extra setup beyond nba_api + pandas.
+Finished seasons that already have a snapshot are skipped and the current season
+is only re-fetched after --ttl-hours (see snapshot_manifest.py).
+
 Usage:
   python scripts/fetch_snapshots_local.py            # last 5 seasons
   python scripts/fetch_snapshots_local.py --seasons 2021-22 2022-23 2023-24
+  python scripts/fetch_snapshots_local.py --force    # re-fetch everything
 """
 
 from __future__ import annotations
@@ -14,11 +19,16 @@ import datetime as _dt
 from pathlib import Path
 import subprocess
 import json
+import sys
 import urllib.parse as _url
 from typing import List
 
 import pandas as pd
-from nba_api.stats.endpoints import LeagueDashPlayerStats
+
+from snapshot_manifest import DEFAULT_TTL, SnapshotManifest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from player_stats_store import season_parquet_bytes, season_path  # noqa: E402
 
 
 NBA_REQUEST_HEADERS = {
@@ -58,10 +68,12 @@ def generate_last_n_seasons(n: int = 5) -> List[str]:
     return list(reversed(seasons))
 
 
-def fetch_season_csv(season: str, out_dir: Path) -> Path:
-    """Fetch using curl (HTTP/2, compressed) first, fallback to nba_api if needed."""
-    base = "https://stats.nba.com/stats/leaguedashplayerstats"
-    params = {
+LEAGUE_DASH_URL = "https://stats.nba.com/stats/leaguedashplayerstats"
+
+
+def league_dash_params(season: str, measure_type: str = "Base") -> dict:
+    """Full query string the stats.nba.com leaguedashplayerstats endpoint expects."""
+    return {
         "College": "",
         "Conference": "",
         "Country": "",
@@ -76,7 +88,7 @@ def fetch_season_csv(season: str, out_dir: Path) -> Path:
         "LastNGames": 0,
         "LeagueID": "00",
         "Location": "",
-        "MeasureType": "Base",
+        "MeasureType": measure_type,
         "Month": 0,
         "OpponentTeamID": 0,
         "Outcome": "",
@@ -100,6 +112,24 @@ def fetch_season_csv(season: str, out_dir: Path) -> Path:
         "Weight": "",
     }
 
+
+def fetch_season(
+    season: str,
+    out_dir: Path,
+    manifest: SnapshotManifest,
+    force: bool = False,
+    ttl: _dt.timedelta = DEFAULT_TTL,
+) -> Path:
+    """Fetch using curl (HTTP/2, compressed) first, fallback to nba_api if needed.
+
+    Skips the request when ``manifest`` says the snapshot is still fresh.
+    """
+    base = LEAGUE_DASH_URL
+    params = league_dash_params(season)
+    out_path = season_path(season, "Base", out_dir / "player_stats")
+    if not manifest.needs_fetch(out_path, season, params, ttl=ttl, force=force):
+        return out_path
+
     query = _url.urlencode(params, doseq=True)
     url = f"{base}?{query}"
 
@@ -122,6 +152,7 @@ def fetch_season_csv(season: str, out_dir: Path) -> Path:
         df = pd.DataFrame(rows, columns=cols)
     except Exception:
         # Fallback to nba_api (may work on some networks)
+        from nba_api.stats.endpoints import LeagueDashPlayerStats
         stats = LeagueDashPlayerStats(
             season=season,
             per_mode_detailed="PerGame",
@@ -130,25 +161,29 @@ def fetch_season_csv(season: str, out_dir: Path) -> Path:
         )
         df = stats.get_data_frames()[0]
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"player_stats_{season.replace('/', '-').replace(' ', '_')}_snapshot.csv"
-    df.to_csv(out_path, index=False)
+    manifest.record(out_path, season, params, season_parquet_bytes(df), len(df))
+    manifest.save()
     return out_path
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--seasons", nargs="*", help="Explicit seasons like 2021-22 2022-23")
+    parser.add_argument("--force", action="store_true", help="Fetch even if snapshots are up to date")
+    parser.add_argument("--ttl-hours", type=float, default=DEFAULT_TTL.total_seconds() / 3600,
+                        help="Re-fetch the current season only after this many hours")
     args = parser.parse_args()
 
     seasons = args.seasons or generate_last_n_seasons(5)
     root = Path(__file__).resolve().parents[1]
     out_dir = root / "sample_data"
+    manifest = SnapshotManifest(out_dir)
+    ttl = _dt.timedelta(hours=args.ttl_hours)
 
     written = []
     for s in seasons:
-        p = fetch_season_csv(s, out_dir)
-        print(f"Wrote {p}")
+        p = fetch_season(s, out_dir, manifest, force=args.force, ttl=ttl)
+        print(f"Snapshot {p}")
         written.append(p)
 
     print("Done:")
@@ -0,0 +1,66 @@
+"""
+Pre-render rolling shot-chart frames into the frame cache used by /shots/frame.
+
+Renders every window of the chosen players with vl-convert (no browser or
+network needed), so /shots/play serves them from disk on the first playback.
+Frames already in the cache are skipped. Run it against the same data and
+SHOTS_FRAMES_DIR / SHOTS_WINDOW_SIZE / SHOTS_FRAME_SCALE as the server,
+since a frame's cache key covers the dataset version and rendering settings.
+
+Usage:
+  python scripts/render_shot_frames.py --top 10               # the 10 players with the most shots
+  python scripts/render_shot_frames.py --players "L. James" "S. Curry" --size 20 --format svg
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+from frame_cache import FRAME_MIMETYPES  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", nargs="*", default=[], help="Player names as in the data (playerNameI)")
+    parser.add_argument("--top", type=int, default=0, help="Also render the N players with the most shots")
+    parser.add_argument("--size", type=int, default=app.SHOTS_WINDOW_SIZE, help="Games per window")
+    parser.add_argument("--format", choices=list(FRAME_MIMETYPES), default="png")
+    args = parser.parse_args()
+
+    if app.vl_convert is None:
+        sys.exit("vl-convert-python is not installed (pip install vl-convert-python)")
+    dataset = app._shots_cache.get()
+    frame, index = dataset.frame, dataset.index
+
+    codes = []
+    for name in args.players:
+        code = frame.player_code(name)
+        if code is None:
+            sys.exit(f"unknown player {name!r}")
+        codes.append(code)
+    if args.top:
+        busiest = np.argsort(-np.diff(index.offsets), kind="stable")[:args.top]
+        codes.extend(int(c) for c in busiest if int(c) not in codes)
+    if not codes:
+        parser.error("give --players and/or --top")
+
+    for code in codes:
+        last_start = max(1, index.max_game(code) - args.size + 1)
+        started = time.perf_counter()
+        for start in range(1, last_start + 1):
+            app._render_frame(dataset, code, start, args.size, args.format)
+        print(f"{frame.player_names[code]}: {last_start} frames in {time.perf_counter() - started:.1f}s")
+    print(f"Frames in {app.SHOTS_FRAMES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Manifest of the player-stat snapshots in sample_data/, shared by the fetch scripts.
+
+sample_data/snapshots_manifest.json records, per snapshot file (keyed by its
+path relative to sample_data/, see player_stats_store.py), the season,
+request params, fetch time, row count and SHA-256 of the file content. The
+fetchers use it to skip work:
+
+- finished seasons are never re-fetched once their snapshot exists;
+- the current season is re-fetched only when its snapshot is older than a TTL;
+- a snapshot is re-fetched if its params changed or the file no longer matches
+  its recorded hash.
+
+Snapshot files and the manifest itself are written atomically (temp file +
+os.replace), and a re-fetch with identical content leaves the file untouched.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_NAME = "snapshots_manifest.json"
+DEFAULT_TTL = _dt.timedelta(hours=12)
+
+
+def current_season(today: Optional[_dt.date] = None) -> str:
+    """Season in progress (or most recently finished, in the off-season), e.g. '2024-25'."""
+    today = today or _dt.date.today()
+    end_year = today.year if today.month < 7 else today.year + 1
+    return f"{end_year - 1}-{end_year % 100:02d}"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class SnapshotManifest:
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        self.path = out_dir / MANIFEST_NAME
+        self.entries: dict = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def _key(self, path: Path) -> str:
+        return path.relative_to(self.out_dir).as_posix()
+
+    def needs_fetch(
+        self,
+        path: Path,
+        season: str,
+        params: dict,
+        ttl: _dt.timedelta = DEFAULT_TTL,
+        force: bool = False,
+    ) -> bool:
+        entry = self.entries.get(self._key(path))
+        if force or entry is None or not path.exists():
+            return True
+        if entry["params"] != json.loads(json.dumps(params)):
+            return True
+        if _sha256(path.read_bytes()) != entry["sha256"]:
+            return True
+        if season != current_season():
+            return False
+        fetched_at = _dt.datetime.fromisoformat(entry["fetched_at"])
+        return _dt.datetime.now(_dt.timezone.utc) - fetched_at > ttl
+
+    def record(self, path: Path, season: str, params: dict, data: bytes, rows: int) -> bool:
+        """Write ``data`` to ``path`` (unless its content is unchanged) and record it.
+
+        Returns True if the file was (re)written. Call ``save()`` afterwards.
+        """
+        digest = _sha256(data)
+        entry = self.entries.get(self._key(path))
+        changed = not (path.exists() and entry is not None and entry["sha256"] == digest)
+        if changed:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, data)
+        self.entries[self._key(path)] = {
+            "season": season,
+            "params": params,
+            "fetched_at": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+            "rows": int(rows),
+            "sha256": digest,
+        }
+        return changed
+
+    def save(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.path, json.dumps(self.entries, indent=2, sort_keys=True).encode("utf-8"))
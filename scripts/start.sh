@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Start Flask (8001) and Streamlit (8501) locally.
+# Start Flask (8000) and Streamlit (8501) locally.
 # No app code is modified; this just automates venv + installs + run.
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -17,22 +17,26 @@ python -m pip install -r requirements.txt -r requirements-streamlit.txt
 
 # Kill any previous instances
 pkill -f "python app.py" || true
+pkill -f "gunicorn -c gunicorn.conf.py" || true
 pkill -f "streamlit run" || true
 
-# Start Flask (8001)
-nohup python app.py >/tmp/flask_8001.out 2>&1 &
-sleep 1
+# Start Flask (8000) under gunicorn; it preloads the shots data before forking workers
+nohup gunicorn -c gunicorn.conf.py wsgi:app >/tmp/flask_8000.out 2>&1 &
+for _ in $(seq 1 120); do
+  curl -fs http://127.0.0.1:8000/readyz >/dev/null 2>&1 && break
+  sleep 1
+done
 
 # Start Streamlit (8501)
 nohup streamlit run "nba_scatter_live_app.py" --server.port 8501 --server.baseUrlPath /nba --server.headless true >/tmp/streamlit_8501.out 2>&1 &
 sleep 2
 
 echo
-echo "Flask:     http://localhost:8001"
+echo "Flask:     http://localhost:8000"
 echo "Explorer:  http://localhost:8501/nba"
 echo
 echo "Logs:"
-echo "  tail -f /tmp/flask_8001.out"
+echo "  tail -f /tmp/flask_8000.out"
 echo "  tail -f /tmp/streamlit_8501.out"
 
 
@@ -0,0 +1,51 @@
+"""
+Download the pinned Vega JS bundles into static/vendor/.
+
+The bundles are committed, so /shots never loads anything from a CDN; run this
+only after bumping a version in app.VENDOR_JS (with --force), then commit the
+new files. The Flask app serves each file at /assets/<name>.<content-hash>.js
+with immutable caching, so a new bundle automatically gets a new URL.
+
+Usage:
+  python scripts/vendor_js.py           # fetch missing bundles
+  python scripts/vendor_js.py --force   # re-download everything
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app import VENDOR_DIR, VENDOR_JS  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="Re-download bundles that already exist")
+    args = parser.parse_args()
+
+    out_dir = Path(VENDOR_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with httpx.Client(http2=True, timeout=30, follow_redirects=True) as client:
+        for name, url in VENDOR_JS.items():
+            out_path = out_dir / f"{name}.js"
+            if out_path.exists() and not args.force:
+                print(f"Have {out_path}")
+                continue
+            resp = client.get(url)
+            resp.raise_for_status()
+            tmp = out_path.with_suffix(".js.tmp")
+            tmp.write_bytes(resp.content)
+            os.replace(tmp, out_path)
+            print(f"Wrote {out_path} ({len(resp.content)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Shots enrichment and server-side data structures for the /shots endpoints."""
+
+import json
+import os
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+def add_game_number(df: pd.DataFrame, base_counts: Optional[Mapping[str, int]] = None) -> pd.DataFrame:
+    """Number each player's games 1..n in chronological order.
+
+    ``base_counts`` holds the number of games already numbered per player (e.g.
+    from earlier seasons); numbering then continues after those.
+    """
+    player_games = (
+        df[["playerNameI", "gameid", "timeActual"]]
+        .dropna(subset=["timeActual"])  # only valid timestamps contribute
+        .drop_duplicates(["playerNameI", "gameid"])  # one row per game
+        .sort_values(["playerNameI", "timeActual", "gameid"])
+    )
+    player_games["game_number"] = player_games.groupby("playerNameI", observed=True).cumcount() + 1
+    if base_counts:
+        offset = player_games["playerNameI"].astype(str).map(base_counts).fillna(0).astype(np.int64)
+        player_games["game_number"] += offset
+    return df.merge(
+        player_games[["playerNameI", "gameid", "game_number"]],
+        on=["playerNameI", "gameid"],
+        how="left",
+    )
+
+
+# Court zones, in the court coordinates of app._make_court_df (x across 0-100,
+# y from the baseline at 4); shots are plotted with court x = shot y, court y = shot x
+ZONES = ("restricted_area", "paint", "mid_range", "corner_three", "above_break_three")
+
+
+def classify_zones(court_x: np.ndarray, court_y: np.ndarray) -> np.ndarray:
+    """Zone code (index into ``ZONES``) of every shot, in one vectorized pass.
+
+    First match wins: the restricted-area semicircle, then the paint, then the
+    corner-three strips below the arc's break, then anything beyond the arc;
+    everything else is mid-range.
+    """
+    restricted = ((court_x - 50) / 8) ** 2 + ((court_y - 4) / 4.5) ** 2 <= 1
+    paint = (court_x >= 34) & (court_x <= 66) & (court_y <= 25.3)
+    corner = ((court_x < 6) | (court_x > 94)) & (court_y <= 14.4)
+    beyond_arc = ((court_x - 50) / 47.5) ** 2 + ((court_y - 4) / 26.65) ** 2 > 1
+    return np.select(
+        [restricted, paint, corner, beyond_arc],
+        [ZONES.index("restricted_area"), ZONES.index("paint"), ZONES.index("corner_three"), ZONES.index("above_break_three")],
+        default=ZONES.index("mid_range"),
+    ).astype(np.int8)
+
+
+def hexbin(x: np.ndarray, y: np.ndarray, made: np.ndarray, radius: float, y_scale: float = 1.0) -> tuple:
+    """Aggregate shots into pointy-top hexagons of circumradius ``radius``.
+
+    Hexagon centers form two offset rectangular lattices; each shot goes to
+    the nearer of its candidate center on either lattice, so binning is a few
+    vectorized passes plus one ``np.unique``. ``y_scale`` stretches y before
+    binning (and is undone on the returned centers) so the hexagons stay
+    regular when the axes are drawn at different pixels per unit.
+
+    Returns ``(cx, cy, attempts, makes)`` for the non-empty cells only; their
+    number is bounded by the grid, not by the number of shots.
+    """
+    dx, dy = np.sqrt(3) * radius, 3 * radius
+    u = np.asarray(x, dtype=np.float64) / dx
+    v = np.asarray(y, dtype=np.float64) * y_scale / dy
+    i1, j1 = np.rint(u), np.rint(v)
+    i2, j2 = np.floor(u), np.floor(v)
+    d1 = ((u - i1) * dx) ** 2 + ((v - j1) * dy) ** 2
+    d2 = ((u - i2 - 0.5) * dx) ** 2 + ((v - j2 - 0.5) * dy) ** 2
+    second = d2 < d1
+    # Cell position in half-steps of the lattice: columns of dx / 2, rows of dy / 2
+    col = np.where(second, 2 * i2 + 1, 2 * i1).astype(np.int64)
+    row = np.where(second, 2 * j2 + 1, 2 * j1).astype(np.int64)
+    cells, first, inverse = np.unique((row << 32) + col, return_index=True, return_inverse=True)
+    attempts = np.bincount(inverse, minlength=len(cells))
+    makes = np.bincount(inverse[np.asarray(made, dtype=bool)], minlength=len(cells))
+    return col[first] * (dx / 2), row[first] * (dy / 2) / y_scale, attempts, makes
+
+
+def _code_dtype(n: int) -> np.dtype:
+    """Smallest signed integer dtype that can hold codes 0..n-1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _dictionary_array(codes: np.ndarray, names: np.ndarray) -> pa.DictionaryArray:
+    """Arrow dictionary column holding only the entries ``codes`` actually uses."""
+    used, indices = np.unique(codes, return_inverse=True)
+    indices = indices.astype(_code_dtype(len(used)))
+    return pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(names[used], type=pa.string()))
+
+
+def _encode(values: pd.Series) -> tuple:
+    """Dictionary-encode ``values``: (sorted unique strings, per-row codes)."""
+    cat = pd.Categorical(values.astype(str))
+    names = np.asarray(cat.categories, dtype=object)
+    return names, cat.codes.astype(_code_dtype(len(names)))
+
+
+class ShotsFrame:
+    """Compact, column-oriented shots table sorted by (player code, game_number).
+
+    Players, games and seasons are dictionary-encoded (``*_codes`` index into
+    the sorted ``player_names`` / ``game_ids`` / ``seasons`` arrays), ``x``/``y``
+    are int16 in tenths of a court unit, made/missed is a bool and
+    ``game_number`` is int16. Strings are only materialized by ``to_pandas``
+    for the rows actually being served.
+    """
+
+    XY_SCALE = 10
+    # Schema metadata key holding the dictionaries in files written by to_arrow_file
+    ARROW_METADATA_KEY = b"shots_frame"
+
+    def __init__(self, player_names, player_codes, game_ids, game_codes, seasons, season_codes,
+                 x_q, y_q, made, game_number, time):
+        self.player_names = player_names
+        self.player_codes = player_codes
+        self.game_ids = game_ids
+        self.game_codes = game_codes
+        self.seasons = seasons
+        self.season_codes = season_codes
+        self.x_q = x_q
+        self.y_q = y_q
+        self.made = made
+        self.game_number = game_number
+        self.time = time
+        self._zones: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame) -> "ShotsFrame":
+        # Shots without a game_number can't be placed in any window, and shots
+        # without coordinates can't be drawn, binned or given a zone
+        df = df.dropna(subset=["playerNameI", "game_number", "x", "y"])
+        player_names, player_codes = _encode(df["playerNameI"])
+        game_ids, game_codes = _encode(df["gameid"])
+        if "Season" in df.columns:
+            seasons, season_codes = _encode(df["Season"])
+        else:
+            seasons, season_codes = np.array([""], dtype=object), np.zeros(len(df), dtype=np.int8)
+        game_number = df["game_number"].to_numpy().astype(np.int16)
+        order = np.lexsort((game_number, player_codes))
+
+        def quantize(col: str) -> np.ndarray:
+            values = np.round(df[col].to_numpy(dtype=np.float64) * cls.XY_SCALE)
+            return np.clip(values, -32768, 32767).astype(np.int16)[order]
+
+        return cls(
+            player_names=player_names,
+            player_codes=player_codes[order],
+            game_ids=game_ids,
+            game_codes=game_codes[order],
+            seasons=seasons,
+            season_codes=season_codes[order],
+            x_q=quantize("x"),
+            y_q=quantize("y"),
+            made=(df["shotResult"] == "Made").to_numpy(dtype=bool)[order],
+            game_number=game_number[order],
+            time=pd.to_datetime(df["timeActual"]).to_numpy().astype("datetime64[ns]", copy=False)[order],
+        )
+
+    def to_arrow_file(self, path: str) -> None:
+        """Write the columns as an uncompressed Arrow IPC (Feather v2) file.
+
+        One record batch, so every column is a single contiguous buffer that
+        ``from_arrow_file`` can map without copying. The string dictionaries
+        are small and go into the schema metadata. Replaces ``path`` atomically.
+        """
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(self.player_codes),
+                pa.array(self.game_codes),
+                pa.array(self.season_codes),
+                pa.array(self.x_q),
+                pa.array(self.y_q),
+                # Arrow booleans are bit-packed; one byte per row keeps the column mappable
+                pa.array(self.made.view(np.uint8)),
+                pa.array(self.game_number),
+                # int64 nanoseconds with NaT as its sentinel, so a missing timestamp
+                # is a plain value rather than a null and the column stays mappable
+                pa.array(self.time.view(np.int64)),
+            ],
+            names=["player_codes", "game_codes", "season_codes", "x_q", "y_q", "made", "game_number", "time"],
+        )
+        meta = {
+            "player_names": self.player_names.tolist(),
+            "game_ids": self.game_ids.tolist(),
+            "seasons": self.seasons.tolist(),
+            "xy_scale": self.XY_SCALE,
+        }
+        schema = batch.schema.with_metadata({self.ARROW_METADATA_KEY: json.dumps(meta).encode("utf-8")})
+        directory, name = os.path.split(path)
+        tmp = os.path.join(directory, f".{name}.tmp")
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+        os.replace(tmp, path)
+
+    @classmethod
+    def from_arrow_file(cls, path: str) -> "ShotsFrame":
+        """Memory-map a file written by ``to_arrow_file``.
+
+        The column arrays are read-only views of the mapping, so every process
+        that maps the same file shares its pages through the OS page cache
+        instead of holding a private copy. Only the dictionaries are decoded
+        into process memory.
+        """
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        meta = json.loads(table.schema.metadata[cls.ARROW_METADATA_KEY])
+        if meta["xy_scale"] != cls.XY_SCALE:
+            raise ValueError(f"{path} was written with xy_scale={meta['xy_scale']}")
+
+        def column(name: str) -> np.ndarray:
+            chunks = table.column(name).chunks
+            if len(chunks) != 1:
+                raise ValueError(f"{path}: column {name} is not a single mappable buffer")
+            return chunks[0].to_numpy(zero_copy_only=True)
+
+        return cls(
+            player_names=np.array(meta["player_names"], dtype=object),
+            player_codes=column("player_codes"),
+            game_ids=np.array(meta["game_ids"], dtype=object),
+            game_codes=column("game_codes"),
+            seasons=np.array(meta["seasons"], dtype=object),
+            season_codes=column("season_codes"),
+            x_q=column("x_q"),
+            y_q=column("y_q"),
+            made=column("made").view(np.bool_),
+            game_number=column("game_number"),
+            time=column("time").view("datetime64[ns]"),
+        )
+
+    @property
+    def zones(self) -> np.ndarray:
+        """Zone code per row (see ``classify_zones``), computed on first use."""
+        if self._zones is None:
+            scale = np.float32(self.XY_SCALE)
+            self._zones = classify_zones(self.y_q / scale, self.x_q / scale)
+        return self._zones
+
+    def __len__(self) -> int:
+        return len(self.player_codes)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (
+            self.player_codes, self.game_codes, self.season_codes,
+            self.x_q, self.y_q, self.made, self.game_number, self.time,
+        ))
+
+    def player_code(self, name: str) -> Optional[int]:
+        i = int(np.searchsorted(self.player_names, name))
+        if i >= len(self.player_names) or self.player_names[i] != name:
+            return None
+        return i
+
+    def to_pandas(self, rows: slice = slice(None)) -> pd.DataFrame:
+        """Decode ``rows`` back into the original string/float columns."""
+        return pd.DataFrame({
+            "playerNameI": self.player_names[self.player_codes[rows]],
+            "gameid": self.game_ids[self.game_codes[rows]],
+            "timeActual": self.time[rows],
+            "x": self.x_q[rows] / self.XY_SCALE,
+            "y": self.y_q[rows] / self.XY_SCALE,
+            "shotResult": np.where(self.made[rows], "Made", "Missed"),
+            "game_number": self.game_number[rows],
+            "Season": self.seasons[self.season_codes[rows]],
+        })
+
+    def to_arrow_ipc(self, rows: slice = slice(None)) -> bytes:
+        """Serialize ``rows`` as an Arrow IPC stream straight from the columns.
+
+        Column names and values match ``to_pandas``; strings stay
+        dictionary-encoded and timestamps are sent as milliseconds, which the
+        browser-side Arrow reader turns into plain numbers.
+        """
+        made = self.made[rows]
+        batch = pa.RecordBatch.from_arrays(
+            [
+                _dictionary_array(self.player_codes[rows], self.player_names),
+                _dictionary_array(self.game_codes[rows], self.game_ids),
+                pa.array(self.time[rows].astype("datetime64[ms]")),
+                pa.array(self.x_q[rows] / np.float32(self.XY_SCALE)),
+                pa.array(self.y_q[rows] / np.float32(self.XY_SCALE)),
+                pa.DictionaryArray.from_arrays(pa.array((~made).astype(np.int8)), pa.array(["Made", "Missed"])),
+                pa.array(self.game_number[rows]),
+            ],
+            names=["playerNameI", "gameid", "timeActual", "x", "y", "shotResult", "game_number"],
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+
+class ShotIndex:
+    """Per-player row offsets into a ``ShotsFrame``.
+
+    The frame is sorted by (player code, game_number), so every player's shots
+    form one contiguous run: ``offsets[code]:offsets[code + 1]``. A player
+    lookup is O(1) and a rolling window is two binary searches over that
+    player's ``game_number`` run. Lookups return slices; ``frame.x_q[sl]`` etc.
+    are views, not copies.
+    """
+
+    def __init__(self, frame: ShotsFrame):
+        self.frame = frame
+        self.offsets = np.searchsorted(
+            frame.player_codes, np.arange(len(frame.player_names) + 1), side="left"
+        ).astype(np.int64)
+        self._zone_prefix: Optional[tuple] = None
+
+    def player_slice(self, code: int) -> slice:
+        return slice(int(self.offsets[code]), int(self.offsets[code + 1]))
+
+    def max_game(self, code: int) -> int:
+        sl = self.player_slice(code)
+        return int(self.frame.game_number[sl.stop - 1]) if sl.stop > sl.start else 0
+
+    def window(self, code: int, start: int, size: int) -> slice:
+        """Rows of player ``code`` with ``start <= game_number < start + size``."""
+        lo, hi = int(self.offsets[code]), int(self.offsets[code + 1])
+        games = self.frame.game_number[lo:hi]
+        a = lo + int(np.searchsorted(games, start, side="left"))
+        b = lo + int(np.searchsorted(games, start + size, side="left"))
+        return slice(a, b)
+
+    def zone_prefix(self) -> tuple:
+        """Running per-zone makes/attempts over every (player, game) slot.
+
+        Returns ``(game_base, makes_cum, attempts_cum)``: player ``code``'s game
+        ``g`` is slot ``game_base[code] + g - 1``, and row ``k`` of the
+        ``(slots + 1, len(ZONES))`` cumulative arrays totals slots ``0..k-1``.
+        Built once, in O(rows), from a single bincount over slot * zones.
+        """
+        if self._zone_prefix is None:
+            frame = self.frame
+            n_zones = len(ZONES)
+            max_games = np.zeros(len(frame.player_names), dtype=np.int64)
+            nonempty = self.offsets[1:] > self.offsets[:-1]
+            max_games[nonempty] = frame.game_number[self.offsets[1:][nonempty] - 1]
+            game_base = np.concatenate(([0], np.cumsum(max_games)))
+            slots = int(game_base[-1])
+            key = (game_base[frame.player_codes] + frame.game_number - 1) * n_zones + frame.zones
+            attempts = np.bincount(key, minlength=slots * n_zones).reshape(slots, n_zones)
+            makes = np.bincount(key[frame.made], minlength=slots * n_zones).reshape(slots, n_zones)
+            zero = np.zeros((1, n_zones), dtype=np.int32)
+            self._zone_prefix = (
+                game_base,
+                np.concatenate((zero, np.cumsum(makes, axis=0, dtype=np.int32))),
+                np.concatenate((zero, np.cumsum(attempts, axis=0, dtype=np.int32))),
+            )
+        return self._zone_prefix
+
+    def zone_windows(self, code: int, size: int) -> tuple:
+        """Per-zone makes and attempts for every ``size``-game window of player ``code``.
+
+        Returns ``(starts, makes, attempts)``; window ``i`` covers games
+        ``starts[i] .. starts[i] + size - 1`` and its row of the
+        ``(len(starts), len(ZONES))`` arrays is the difference of two prefix
+        rows, so all windows together cost O(games). Like the chart's slider,
+        starts run up to the player's last game, so the final windows are
+        cut off there.
+        """
+        game_base, makes_cum, attempts_cum = self.zone_prefix()
+        first, games = int(game_base[code]), int(game_base[code + 1] - game_base[code])
+        starts = np.arange(1, max(1, games) + 1)
+        lo = first + starts - 1
+        hi = first + np.minimum(starts + size - 1, games)
+        return starts, makes_cum[hi] - makes_cum[lo], attempts_cum[hi] - attempts_cum[lo]
+
+    def zone_totals(self) -> tuple:
+        """League-wide (makes, attempts) per zone."""
+        _, makes_cum, attempts_cum = self.zone_prefix()
+        return makes_cum[-1], attempts_cum[-1]
@@ -0,0 +1,187 @@
+// Minimal Arrow IPC stream reader for the /shots data endpoints.
+//
+// readArrowRows(buffer) decodes a stream written by ShotsFrame.to_arrow_ipc
+// into plain row objects for vega's view.change(). It handles what that
+// writer emits: one schema, dictionary batches, and uncompressed record
+// batches of Int, FloatingPoint, Utf8 and Timestamp columns (optionally
+// dictionary-encoded, with validity bitmaps). Int64 and timestamp values
+// become Numbers (timestamps in their unit, i.e. epoch ms from the server).
+// tests/test_arrow_rows_js.py checks the writer against this list.
+(function (root) {
+  'use strict';
+
+  // Flatbuffers: a table starts with an int32 offset back to its vtable,
+  // whose uint16 slots give each field's offset within the table (0 = absent)
+  function Table(view, pos) { this.view = view; this.pos = pos; }
+  Table.prototype.field = function (i) {
+    const vt = this.pos - this.view.getInt32(this.pos, true);
+    const slot = 4 + 2 * i;
+    return slot < this.view.getUint16(vt, true) ? this.view.getUint16(vt + slot, true) : 0;
+  };
+  Table.prototype.scalar = function (i, get, dflt) {
+    const off = this.field(i);
+    return off ? get(this.view, this.pos + off) : dflt;
+  };
+  Table.prototype.deref = function (i) {
+    const off = this.field(i);
+    if (!off) return null;
+    const at = this.pos + off;
+    return at + this.view.getUint32(at, true);
+  };
+  Table.prototype.table = function (i) {
+    const at = this.deref(i);
+    return at === null ? null : new Table(this.view, at);
+  };
+  Table.prototype.string = function (i) {
+    const at = this.deref(i);
+    if (at === null) return null;
+    const len = this.view.getUint32(at, true);
+    return UTF8.decode(new Uint8Array(this.view.buffer, this.view.byteOffset + at + 4, len));
+  };
+  // Vector of tables: [length, uint32 offsets relative to each slot]
+  Table.prototype.tables = function (i) {
+    const at = this.deref(i);
+    if (at === null) return [];
+    const out = [];
+    for (let k = 0, n = this.view.getUint32(at, true); k < n; k++) {
+      const slot = at + 4 + 4 * k;
+      out.push(new Table(this.view, slot + this.view.getUint32(slot, true)));
+    }
+    return out;
+  };
+  // Vector of structs made of int64 pairs (FieldNode, Buffer)
+  Table.prototype.longPairs = function (i) {
+    const at = this.deref(i);
+    if (at === null) return [];
+    const out = [];
+    for (let k = 0, n = this.view.getUint32(at, true); k < n; k++) {
+      const p = at + 4 + 16 * k;
+      out.push([i64(this.view, p), i64(this.view, p + 8)]);
+    }
+    return out;
+  };
+
+  const UTF8 = new TextDecoder('utf-8');
+  const i8 = (v, p) => v.getInt8(p);
+  const u8 = (v, p) => v.getUint8(p);
+  const i16 = (v, p) => v.getInt16(p, true);
+  const i32 = (v, p) => v.getInt32(p, true);
+  const i64 = (v, p) => Number(v.getBigInt64(p, true));
+
+  // Message header and Type union members (Message.fbs / Schema.fbs)
+  const SCHEMA = 1, DICTIONARY_BATCH = 2, RECORD_BATCH = 3;
+  const INT = 2, FLOAT = 3, UTF8_TYPE = 5, TIMESTAMP = 10;
+
+  function intReader(bitWidth, signed) {
+    const get = {
+      8: signed ? i8 : u8,
+      16: signed ? i16 : (v, p) => v.getUint16(p, true),
+      32: signed ? i32 : (v, p) => v.getUint32(p, true),
+      64: signed ? i64 : (v, p) => Number(v.getBigUint64(p, true)),
+    }[bitWidth];
+    if (!get) throw new Error('unsupported Arrow int width ' + bitWidth);
+    return {width: bitWidth / 8, get: get};
+  }
+
+  // How to read one value of a field's (storage) type from its data buffer
+  function valueReader(typeType, type) {
+    if (typeType === INT) {
+      return intReader(type.scalar(0, i32, 0), type.scalar(1, u8, 0) !== 0);
+    }
+    if (typeType === FLOAT) {
+      const precision = type.scalar(0, i16, 0);
+      if (precision === 1) return {width: 4, get: (v, p) => v.getFloat32(p, true)};
+      if (precision === 2) return {width: 8, get: (v, p) => v.getFloat64(p, true)};
+    }
+    if (typeType === TIMESTAMP) return {width: 8, get: i64};
+    if (typeType === UTF8_TYPE) return {utf8: true};
+    throw new Error('unsupported Arrow type ' + typeType);
+  }
+
+  function parseField(field) {
+    const dict = field.table(4);
+    const value = valueReader(field.scalar(2, u8, 0), field.table(3));
+    if (!dict) return {name: field.string(0), value: value, dictId: null};
+    const indexType = dict.table(1);
+    return {
+      name: field.string(0),
+      value: value,
+      dictId: dict.scalar(0, i64, 0),
+      index: indexType ? intReader(indexType.scalar(0, i32, 32), indexType.scalar(1, u8, 0) !== 0) : intReader(32, true),
+    };
+  }
+
+  // Decode column i of a RecordBatch body; returns an array of values (null where invalid)
+  function readColumn(body, nodes, buffers, storage) {
+    const [length, nullCount] = nodes.shift();
+    const [validOff, validLen] = buffers.shift();
+    const valid = nullCount > 0 && validLen > 0 ? new Uint8Array(body.buffer, body.byteOffset + validOff, validLen) : null;
+    const out = new Array(length);
+    if (storage.utf8) {
+      const [offOff] = buffers.shift();
+      const [dataOff] = buffers.shift();
+      for (let r = 0; r < length; r++) {
+        const a = body.getInt32(offOff + 4 * r, true), b = body.getInt32(offOff + 4 * r + 4, true);
+        out[r] = UTF8.decode(new Uint8Array(body.buffer, body.byteOffset + dataOff + a, b - a));
+      }
+    } else {
+      const [dataOff] = buffers.shift();
+      for (let r = 0; r < length; r++) out[r] = storage.get(body, dataOff + storage.width * r);
+    }
+    if (valid) {
+      for (let r = 0; r < length; r++) if (!(valid[r >> 3] & (1 << (r & 7)))) out[r] = null;
+    }
+    return out;
+  }
+
+  function readArrowRows(buffer) {
+    const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const dictionaries = new Map();
+    const rows = [];
+    let fields = null;
+    let pos = 0;
+    while (pos + 8 <= view.byteLength) {
+      // Message framing: 0xFFFFFFFF continuation, int32 metadata length (0 = end of stream)
+      let metaLen = view.getInt32(pos, true);
+      pos += 4;
+      if (metaLen === -1) { metaLen = view.getInt32(pos, true); pos += 4; }
+      if (metaLen === 0) break;
+      const meta = new DataView(bytes.buffer, bytes.byteOffset + pos, metaLen);
+      const message = new Table(meta, meta.getUint32(0, true));
+      const bodyLen = message.scalar(3, i64, 0);
+      const body = new DataView(bytes.buffer, bytes.byteOffset + pos + metaLen, bodyLen);
+      pos += metaLen + bodyLen;
+      const kind = message.scalar(1, u8, 0);
+      const header = message.table(2);
+      if (kind === SCHEMA) {
+        fields = header.tables(1).map(parseField);
+      } else if (kind === DICTIONARY_BATCH) {
+        const id = header.scalar(0, i64, 0);
+        const field = fields.find((f) => f.dictId === id);
+        const batch = header.table(1);
+        if (batch.table(3)) throw new Error('compressed Arrow batches are not supported');
+        const values = readColumn(body, batch.longPairs(1), batch.longPairs(2), field.value);
+        const prior = header.scalar(2, u8, 0) ? dictionaries.get(id) || [] : [];
+        dictionaries.set(id, prior.concat(values));
+      } else if (kind === RECORD_BATCH) {
+        if (header.table(3)) throw new Error('compressed Arrow batches are not supported');
+        const nodes = header.longPairs(1), buffers = header.longPairs(2);
+        const columns = fields.map((f) => {
+          if (f.dictId === null) return readColumn(body, nodes, buffers, f.value);
+          const dict = dictionaries.get(f.dictId);
+          return readColumn(body, nodes, buffers, f.index).map((k) => (k === null ? null : dict[k]));
+        });
+        for (let r = 0, n = header.scalar(0, i64, 0); r < n; r++) {
+          const row = {};
+          fields.forEach((f, c) => { row[f.name] = columns[c][r]; });
+          rows.push(row);
+        }
+      }
+    }
+    return rows;
+  }
+
+  root.readArrowRows = readArrowRows;
+  if (typeof module === 'object' && module.exports) module.exports = readArrowRows;
+})(typeof globalThis !== 'undefined' ? globalThis : this);
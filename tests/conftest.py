@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+def make_raw_shots(season: str, players=("A. One", "B. Two", "C. Three"), games: int = 6,
+                   shots_per_game: int = 5, seed: int = 0) -> pd.DataFrame:
+    """Raw shots in the nba_shots parquet layout: every player shoots in every game of ``season``."""
+    rng = np.random.default_rng(seed)
+    year = int(season[:4])
+    rows = []
+    for g in range(games):
+        gameid = f"00{year % 100:02d}{g:05d}"
+        tip = pd.Timestamp(f"{year}-11-01") + pd.Timedelta(days=2 * g)
+        for player in players:
+            for k in range(shots_per_game):
+                rows.append({
+                    "playerNameI": player,
+                    "gameid": gameid,
+                    "timeActual": tip + pd.Timedelta(minutes=k),
+                    "x": float(rng.uniform(4, 50)),
+                    "y": float(rng.uniform(0, 100)),
+                    "shotResult": "Made" if rng.random() < 0.45 else "Missed",
+                    "Season": season,
+                })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def raw_shots() -> pd.DataFrame:
+    return pd.concat([make_raw_shots("2022-23", seed=1), make_raw_shots("2023-24", seed=2)], ignore_index=True)
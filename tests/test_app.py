@@ -0,0 +1,154 @@
+import pandas as pd
+import pytest
+
+import app as shots_app
+from shots_data import ZONES, ShotsFrame, add_game_number
+
+
+@pytest.fixture
+def client(raw_shots, tmp_path, monkeypatch):
+    path = tmp_path / "shots.parquet"
+    raw_shots.to_parquet(path, index=False)
+    monkeypatch.setattr(shots_app, "_shots_cache", shots_app._ShotsCache([str(path)]))
+    monkeypatch.setattr(shots_app, "_shots_page", None)
+    shots_app._density_cache.clear()
+    return shots_app.app.test_client()
+
+
+WINDOW_ENDPOINTS = ["/shots/window", "/shots/density", "/shots/zones", "/shots/frame"]
+VERSIONED_ENDPOINTS = ["/shots/window", "/shots/density", "/shots/zones"]
+
+
+@pytest.mark.parametrize("endpoint", WINDOW_ENDPOINTS)
+@pytest.mark.parametrize("query", ["start=x", "size=1.5", "start=0", "start=-2", "size=0", "size=-1"])
+def test_window_endpoints_reject_bad_start_and_size(client, endpoint, query):
+    resp = client.get(f"{endpoint}?player=A.%20One&{query}")
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+@pytest.mark.parametrize("query", ["size=abc", "size=0", "format=gif"])
+def test_play_rejects_bad_size_and_format(client, query):
+    assert client.get(f"/shots/play?{query}").status_code == 400
+
+
+def test_frame_rejects_unknown_format(client):
+    assert client.get("/shots/frame?player=A.%20One&format=gif").status_code == 400
+
+
+@pytest.mark.parametrize("endpoint", WINDOW_ENDPOINTS)
+def test_window_endpoints_404_unknown_player(client, endpoint):
+    assert client.get(f"{endpoint}?player=Nobody&start=1&size=3").status_code == 404
+
+
+@pytest.mark.parametrize("endpoint", VERSIONED_ENDPOINTS)
+def test_versioned_window_responses_are_immutable(client, endpoint):
+    version = shots_app._shots_cache.get().fingerprint
+    resp = client.get(f"{endpoint}?player=A.%20One&start=2&size=3&v={version}")
+    assert resp.status_code == 200
+    assert "immutable" in resp.headers["Cache-Control"]
+    resp = client.get(f"{endpoint}?player=A.%20One&start=2&size=3")
+    assert resp.headers["Cache-Control"] == "no-cache"
+
+
+def test_window_returns_only_the_window(client):
+    resp = client.get("/shots/window?player=A.%20One&start=5&size=2&format=json")
+    rows = resp.get_json()
+    assert {r["game_number"] for r in rows} == {5, 6}
+    assert {r["playerNameI"] for r in rows} == {"A. One"}
+
+
+def test_zones_single_window(client):
+    body = client.get("/shots/zones?player=B.%20Two&start=3&size=4").get_json()
+    assert body["zones"] == list(ZONES)
+    assert body["starts"] == [3]
+    # 5 shots per game over games 3-6
+    assert sum(body["attempts"][0]) == 20
+
+
+def test_shots_page_loads_only_local_scripts(client):
+    resp = client.get("/shots")
+    assert resp.status_code == 200
+    page = resp.get_data(as_text=True)
+    assert "cdn.jsdelivr.net" not in page
+    for url in shots_app.SCRIPT_URLS:
+        assert url.startswith("/assets/") and url in page
+        asset = client.get(url)
+        assert asset.status_code == 200 and "immutable" in asset.headers["Cache-Control"]
+
+
+def test_warm_preloads_dataset_and_page(client):
+    assert client.get("/readyz").status_code == 503
+    assert shots_app.warm()
+    body = client.get("/readyz").get_json()
+    assert body["version"] == shots_app._shots_cache.get().fingerprint
+
+
+def test_warm_builds_zone_prefix(client):
+    assert shots_app.warm()
+    dataset = shots_app._shots_cache.get()
+    assert dataset.index._zone_prefix is not None
+
+
+def test_cold_start_falls_back_to_the_next_loadable_source(raw_shots, tmp_path):
+    broken = tmp_path / "_shots.arrow"
+    broken.write_bytes(b"not an arrow file")
+    parquet = tmp_path / "shots.parquet"
+    raw_shots.to_parquet(parquet, index=False)
+    cache = shots_app._ShotsCache([str(broken), str(parquet)], check_interval=0)
+    assert cache.get().version[0] == str(parquet)
+    # The broken file isn't retried until it changes
+    assert cache.get().version[0] == str(parquet)
+    assert set(cache._failed) == {str(broken)}
+
+
+def test_cold_start_raises_when_no_source_loads(tmp_path):
+    broken = tmp_path / "_shots.arrow"
+    broken.write_bytes(b"not an arrow file")
+    cache = shots_app._ShotsCache([str(broken), str(tmp_path / "missing.parquet")], check_interval=0)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            cache.get()
+    assert not cache.ready
+
+
+def test_cache_maps_an_arrow_file_from_any_directory(raw_shots, tmp_path):
+    frame = ShotsFrame.from_pandas(add_game_number(raw_shots))
+    path = tmp_path / "elsewhere" / "_shots.arrow"
+    path.parent.mkdir()
+    frame.to_arrow_file(str(path))
+    loaded = shots_app._ShotsCache([str(path)]).get().frame
+    # Mapped read-only, not read as parquet
+    assert not loaded.x_q.flags.writeable
+    pd.testing.assert_frame_equal(loaded.to_pandas(), frame.to_pandas())
+
+
+def _rewrite_shots(raw_shots, tmp_path, games: int) -> None:
+    raw_shots[raw_shots["gameid"].str[-5:].astype(int) < games].to_parquet(tmp_path / "shots.parquet", index=False)
+
+
+def test_cache_reloads_when_the_file_changes(client, raw_shots, tmp_path):
+    cache = shots_app._shots_cache
+    cache.check_interval = 0
+    old = cache.get()
+    assert cache.get() is old
+    _rewrite_shots(raw_shots, tmp_path, games=3)
+    new = cache.get()
+    assert new.fingerprint != old.fingerprint
+    assert len(new.frame) < len(old.frame)
+    # Requests still holding the old dataset keep a consistent copy
+    assert len(old.frame) == len(raw_shots)
+
+
+def test_shots_page_revalidates_with_etag(client, raw_shots, tmp_path):
+    shots_app._shots_cache.check_interval = 0
+    first = client.get("/shots")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and "no-cache" in first.headers["Cache-Control"]
+    assert client.get("/shots", headers={"If-None-Match": etag}).status_code == 304
+
+    _rewrite_shots(raw_shots, tmp_path, games=3)
+    second = client.get("/shots", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert second.get_data() != first.get_data()
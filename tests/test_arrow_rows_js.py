@@ -0,0 +1,81 @@
+"""static/js/arrow_rows.js only reads what ShotsFrame.to_arrow_ipc writes today; keep the two in step."""
+
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from conftest import ROOT
+from shots_data import ShotIndex, ShotsFrame, add_game_number
+
+READER = ROOT / "static" / "js" / "arrow_rows.js"
+
+
+def _supported(value_type: pa.DataType) -> bool:
+    # The reader's valueReader(): Int, 32/64-bit FloatingPoint, Utf8 and Timestamp
+    return (
+        pa.types.is_integer(value_type)
+        or pa.types.is_float32(value_type)
+        or pa.types.is_float64(value_type)
+        or value_type == pa.string()
+        or pa.types.is_timestamp(value_type)
+    )
+
+
+@pytest.fixture
+def ipc_body(raw_shots) -> tuple:
+    raw_shots.loc[0, "timeActual"] = pd.NaT
+    frame = ShotsFrame.from_pandas(add_game_number(raw_shots))
+    rows = ShotIndex(frame).player_slice(0)
+    return frame, rows, frame.to_arrow_ipc(rows)
+
+
+def test_writer_only_emits_types_the_reader_supports(ipc_body):
+    _, _, body = ipc_body
+    schema = pa.ipc.open_stream(body).schema
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            assert pa.types.is_integer(field.type.index_type), field
+            assert _supported(field.type.value_type), field
+        else:
+            assert _supported(field.type), field
+
+
+def test_writer_does_not_compress(ipc_body):
+    _, _, body = ipc_body
+    table = pa.ipc.open_stream(body).read_all()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=None)) as writer:
+        for batch in table.to_batches():
+            writer.write_batch(batch)
+    assert sink.getvalue().to_pybytes() == body
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_reader_round_trip_in_node(ipc_body, tmp_path):
+    frame, rows, body = ipc_body
+    stream = tmp_path / "shots.arrows"
+    stream.write_bytes(body)
+    script = (
+        f"const readArrowRows = require({json.dumps(str(READER))});"
+        f"const bytes = require('fs').readFileSync({json.dumps(str(stream))});"
+        "process.stdout.write(JSON.stringify(readArrowRows(bytes)));"
+    )
+    got = pd.DataFrame(json.loads(subprocess.run(["node", "-e", script], check=True, capture_output=True).stdout))
+
+    expected = frame.to_pandas(rows).drop(columns=["Season"])
+    assert list(got.columns) == list(expected.columns)
+    for column in ("playerNameI", "gameid", "shotResult", "game_number"):
+        assert got[column].tolist() == expected[column].tolist()
+    np.testing.assert_allclose(got["x"], expected["x"], atol=1e-5)
+    np.testing.assert_allclose(got["y"], expected["y"], atol=1e-5)
+    # Epoch milliseconds, with the missing timestamp read back as null
+    times = expected["timeActual"]
+    assert got["timeActual"].isna().tolist() == times.isna().tolist()
+    assert got["timeActual"].dropna().astype(np.int64).tolist() == (
+        times.dropna().astype("datetime64[ms]").astype(np.int64).tolist()
+    )
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from build_shots_store import ARROW_NAME, build_store
+from conftest import make_raw_shots
+from shots_data import ShotsFrame
+
+
+def _write_sources(directory, frames):
+    directory.mkdir(exist_ok=True)
+    paths = []
+    for season, df in frames.items():
+        path = directory / f"{season}.parquet"
+        df.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def _store_contents(out_dir) -> pd.DataFrame:
+    df = pd.read_parquet(out_dir)
+    df["Season"] = df["Season"].astype(str)
+    return df.sort_values(["Season", "playerNameI", "timeActual"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("changed", ["2022-23", "2023-24"])
+def test_incremental_build_equals_full_build(tmp_path, changed):
+    seasons = {"2022-23": make_raw_shots("2022-23", seed=1), "2023-24": make_raw_shots("2023-24", seed=2)}
+    incremental = tmp_path / "incremental"
+    sources = _write_sources(tmp_path / "src", seasons)
+    assert build_store(sources, incremental) == ["2022-23", "2023-24"]
+    assert build_store(sources, incremental) == []
+
+    # A new player and extra games in one season; later seasons must be renumbered
+    seasons[changed] = pd.concat([
+        seasons[changed],
+        make_raw_shots(changed, players=("D. Four",), games=2, seed=3),
+        make_raw_shots(changed, games=8, seed=4).iloc[-30:],
+    ], ignore_index=True)
+    _write_sources(tmp_path / "src", {changed: seasons[changed]})
+    written = build_store(sources, incremental)
+    assert written == [s for s in sorted(seasons) if s >= changed]
+
+    full = tmp_path / "full"
+    build_store(sources, full, full=True)
+    pd.testing.assert_frame_equal(_store_contents(incremental), _store_contents(full))
+    pd.testing.assert_frame_equal(
+        ShotsFrame.from_arrow_file(str(incremental / ARROW_NAME)).to_pandas(),
+        ShotsFrame.from_arrow_file(str(full / ARROW_NAME)).to_pandas(),
+    )
+
+
+def test_game_numbers_continue_across_seasons(tmp_path):
+    sources = _write_sources(tmp_path / "src", {
+        "2022-23": make_raw_shots("2022-23", games=4),
+        "2023-24": make_raw_shots("2023-24", games=3),
+    })
+    build_store(sources, tmp_path / "store")
+    df = _store_contents(tmp_path / "store")
+    later = df[df["Season"] == "2023-24"]
+    assert sorted(later["game_number"].unique().tolist()) == [5, 6, 7]
+
+
+def test_app_loads_a_store_from_any_directory(tmp_path):
+    import app as shots_app
+
+    sources = _write_sources(tmp_path / "src", {"2022-23": make_raw_shots("2022-23")})
+    store = tmp_path / "elsewhere" / "store"
+    build_store(sources, store)
+    frame = shots_app._ShotsCache([str(store / "_manifest.json")]).get().frame
+    pd.testing.assert_frame_equal(frame.to_pandas(), ShotsFrame.from_pandas(_store_contents(store)).to_pandas())
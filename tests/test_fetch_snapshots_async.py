@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from fetch_snapshots_async import fetch_all, snapshot_path
+from snapshot_manifest import MANIFEST_NAME
+
+SEASONS = ["2015-16", "2016-17", "2017-18", "2018-19", "2019-20"]
+
+
+class StandIn(ThreadingHTTPServer):
+    """Answers each season's first request with a 503, later ones with its stats."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandIn
+
+    def do_GET(self):
+        season = parse_qs(urlparse(self.path).query)["Season"][0]
+        with self.server.lock:
+            self.server.requests[season] += 1
+            first = self.server.requests[season] == 1
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            time.sleep(0.05)
+            if first:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = json.dumps({"resultSets": [{
+                "headers": ["PLAYER_NAME", "TEAM_ABBREVIATION", "PTS"],
+                "rowSet": [["A. One", "AAA", 20.5], ["B. Two", "BBB", 11.0]],
+            }]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_all_retries_and_bounds_concurrency(stand_in, tmp_path):
+    url = f"http://127.0.0.1:{stand_in.server_address[1]}/stats/leaguedashplayerstats"
+    written = asyncio.run(fetch_all(SEASONS, ["Base"], tmp_path, url=url, concurrency=2, rate=100,
+                                    retries=2, backoff=0.01))
+
+    # Every season failed once and was retried once
+    assert stand_in.requests == Counter({season: 2 for season in SEASONS})
+    assert stand_in.max_in_flight == 2
+    assert sorted(written) == sorted(snapshot_path(tmp_path, s) for s in SEASONS)
+    for path in written:
+        assert pd.read_parquet(path)["PLAYER_NAME"].tolist() == ["A. One", "B. Two"]
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert {entry["season"] for entry in manifest.values()} == set(SEASONS)
+    assert all(entry["rows"] == 2 for entry in manifest.values())
+
+    # Finished seasons are up to date now: nothing is requested again
+    assert asyncio.run(fetch_all(SEASONS, ["Base"], tmp_path, url=url, concurrency=2, rate=100)) == []
+    assert sum(stand_in.requests.values()) == 2 * len(SEASONS)
+
+
+def test_fetch_all_gives_up_after_retries(stand_in, tmp_path):
+    url = f"http://127.0.0.1:{stand_in.server_address[1]}/stats/leaguedashplayerstats"
+    with pytest.raises(Exception, match="503"):
+        asyncio.run(fetch_all(SEASONS[:1], ["Base"], tmp_path, url=url, rate=100, retries=0, backoff=0.01))
+    assert not snapshot_path(tmp_path, SEASONS[0]).exists()
@@ -0,0 +1,86 @@
+import os
+
+from metrics import Registry
+
+
+def _registry(directory=None) -> Registry:
+    registry = Registry(str(directory) if directory is not None else None)
+    registry.counter("requests_total", "Requests.", ["route"])
+    registry.gauge("rows", "Rows.")
+    registry.histogram("seconds", "Latency.", buckets=(0.1, 1.0))
+    return registry
+
+
+def _sample(text: str, name: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise KeyError(name)
+
+
+def _record(registry: Registry, n: int, rows: int, pid: int, monkeypatch) -> None:
+    counter, gauge, histogram = registry._metrics
+    for _ in range(n):
+        counter.inc(route="/shots")
+        histogram.observe(0.5)
+    gauge.set(rows)
+    monkeypatch.setattr(os, "getpid", lambda: pid)
+    registry.write_snapshot()
+
+
+def test_single_process_render():
+    registry = _registry()
+    counter, gauge, histogram = registry._metrics
+    counter.inc(route="/shots")
+    histogram.observe(0.05)
+    histogram.observe(5)
+    text = registry.render()
+    assert 'requests_total{route="/shots"} 1' in text
+    assert 'seconds_bucket{le="0.1"} 1' in text
+    assert 'seconds_bucket{le="+Inf"} 2' in text
+    assert "seconds_count 2" in text
+
+
+def test_multiprocess_render_sums_every_worker(tmp_path, monkeypatch):
+    workers = [_registry(tmp_path) for _ in range(3)]
+    for pid, (registry, n) in enumerate(zip(workers, (2, 3, 4)), start=100):
+        _record(registry, n, rows=1000, pid=pid, monkeypatch=monkeypatch)
+
+    # Whichever worker answers the scrape, the totals are the same
+    for pid, registry in enumerate(workers, start=100):
+        monkeypatch.setattr(os, "getpid", lambda pid=pid: pid)
+        text = registry.render()
+        assert _sample(text, 'requests_total{route="/shots"}') == 9
+        assert _sample(text, "seconds_count") == 9
+        assert _sample(text, 'seconds_bucket{le="1"}') == 9
+        assert _sample(text, "rows") == 1000
+
+
+def test_exited_workers_keep_counters_but_not_gauges(tmp_path, monkeypatch):
+    first, second = _registry(tmp_path), _registry(tmp_path)
+    _record(first, 5, rows=1000, pid=100, monkeypatch=monkeypatch)
+    _record(second, 1, rows=10, pid=101, monkeypatch=monkeypatch)
+    master = _registry(tmp_path)
+    master.mark_process_dead(100)
+    assert not (tmp_path / "100.json").exists()
+
+    text = second.render()
+    assert _sample(text, 'requests_total{route="/shots"}') == 6
+    assert _sample(text, "rows") == 10
+
+    # A replacement worker starts from zero; totals never go backwards
+    replacement = _registry(tmp_path)
+    _record(replacement, 1, rows=10, pid=102, monkeypatch=monkeypatch)
+    master.mark_process_dead(101)
+    assert _sample(replacement.render(), 'requests_total{route="/shots"}') == 7
+
+
+def test_clear_keeps_gauges():
+    registry = _registry()
+    counter, gauge, _ = registry._metrics
+    counter.inc(route="/shots")
+    gauge.set(5)
+    registry.clear()
+    text = registry.render()
+    assert "requests_total{" not in text
+    assert _sample(text, "rows") == 5
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from player_stats_store import SeasonStore
+
+ROWS = 1000
+
+
+def _season_frame(season: str) -> pd.DataFrame:
+    return pd.DataFrame({
+        "TEAM_ABBREVIATION": np.resize(["AAA", "BBB"], ROWS),
+        "PTS": np.arange(ROWS, dtype=np.float64),
+        "season": season,
+    })
+
+
+SEASON_BYTES = int(_season_frame("2019-20").memory_usage(deep=True).sum())
+
+
+class StubLoader:
+    """Builds a synthetic season and counts calls; ``gate`` holds loads until set."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = set()
+
+    def __call__(self, season: str) -> pd.DataFrame:
+        self.calls[season] += 1
+        self.gate.wait(5)
+        if season in self.fail:
+            raise OSError(f"cannot read {season}")
+        return _season_frame(season)
+
+
+@pytest.fixture
+def loader() -> StubLoader:
+    return StubLoader()
+
+
+def _store(loader, seasons_that_fit: int) -> SeasonStore:
+    return SeasonStore(loader, budget_bytes=seasons_that_fit * SEASON_BYTES,
+                       describe=lambda df: {"rows": len(df)})
+
+
+def _wait_for_prefetch(store: SeasonStore) -> None:
+    for future in list(store._pending.values()):
+        future.result()
+
+
+def test_get_loads_each_season_once(loader):
+    store = _store(loader, 2)
+    data = store.get("2019-20")
+    assert store.get("2019-20") is data
+    assert loader.calls["2019-20"] == 1
+    assert data.teams == ["AAA", "BBB"]
+    assert data.meta == {"rows": ROWS}
+    assert data.df.take(data.team_rows["BBB"])["TEAM_ABBREVIATION"].eq("BBB").all()
+
+
+def test_concurrent_gets_share_one_load(loader):
+    store = _store(loader, 2)
+    loader.gate.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get("2019-20"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    loader.gate.set()
+    for t in threads:
+        t.join()
+    assert loader.calls["2019-20"] == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_least_recently_used_season_is_evicted(loader):
+    store = _store(loader, 2)
+    for season in ("2017-18", "2018-19", "2019-20"):
+        store.get(season)
+    assert list(store._seasons) == ["2018-19", "2019-20"]
+    store.get("2018-19")
+    store.get("2020-21")
+    assert list(store._seasons) == ["2018-19", "2020-21"]
+    assert store.nbytes <= store.budget_bytes
+
+
+def test_latest_season_is_kept_even_over_budget(loader):
+    store = SeasonStore(loader, budget_bytes=SEASON_BYTES // 2)
+    store.get("2018-19")
+    store.get("2019-20")
+    assert list(store._seasons) == ["2019-20"]
+
+
+def test_prefetch_never_evicts_loaded_seasons(loader):
+    store = _store(loader, 2)
+    store.get("2018-19")
+    store.get("2019-20")
+    store.prefetch(["2020-21", "2017-18"])
+    _wait_for_prefetch(store)
+    assert loader.calls["2020-21"] == loader.calls["2017-18"] == 1
+    assert list(store._seasons) == ["2018-19", "2019-20"]
+
+
+def test_prefetched_season_is_evicted_first(loader):
+    store = _store(loader, 3)
+    store.get("2018-19")
+    store.prefetch(["2019-20"])
+    _wait_for_prefetch(store)
+    store.get("2020-21")
+    assert list(store._seasons) == ["2019-20", "2018-19", "2020-21"]
+    store.get("2021-22")
+    assert list(store._seasons) == ["2018-19", "2020-21", "2021-22"]
+
+
+def test_get_of_a_prefetching_season_keeps_it(loader):
+    store = _store(loader, 1)
+    store.get("2018-19")
+    loader.gate.clear()
+    store.prefetch(["2019-20"])
+    done = []
+    waiter = threading.Thread(target=lambda: done.append(store.get("2019-20")))
+    waiter.start()
+    while "2019-20" not in store._wanted:
+        time.sleep(0.001)
+    loader.gate.set()
+    waiter.join()
+    # The prefetch was reused rather than started again, and the get wins over the budget
+    assert loader.calls["2019-20"] == 1
+    assert list(store._seasons) == ["2019-20"]
+    assert store.get("2019-20") is done[0]
+
+
+def test_failed_load_is_retried(loader):
+    store = _store(loader, 2)
+    loader.fail.add("2019-20")
+    with pytest.raises(OSError):
+        store.get("2019-20")
+    loader.fail.clear()
+    assert store.get("2019-20").season == "2019-20"
+    assert loader.calls["2019-20"] == 2
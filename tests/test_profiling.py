@@ -0,0 +1,50 @@
+import pytest
+
+import profiling
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "s3cret")
+
+
+def test_off_unless_enabled(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", False)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "s3cret")
+    assert not profiling.requested("s3cret")
+
+
+def test_requires_a_configured_token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "")
+    for flag in ("1", "", "anything"):
+        assert not profiling.requested(flag)
+
+
+@pytest.mark.parametrize("flag, expected", [
+    ("s3cret", True),
+    ("s3cre", False),
+    ("1", False),
+    (None, False),
+    ("", False),
+    ("é", False),
+    ("\udcff", False),
+])
+def test_token_comparison(enabled, flag, expected):
+    assert profiling.requested(flag) is expected
+
+
+def test_non_ascii_token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "clé")
+    assert profiling.requested("clé")
+    assert not profiling.requested("cle")
+
+
+def test_non_ascii_query_flag_is_not_a_server_error(enabled):
+    import app as shots_app
+
+    resp = shots_app.app.test_client().get("/healthz?profile=%C3%A9")
+    assert resp.status_code == 200
+    assert "X-Profile-File" not in resp.headers
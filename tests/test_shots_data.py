@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from shots_data import ZONES, ShotIndex, ShotsFrame, add_game_number, classify_zones, hexbin
+
+
+@pytest.fixture
+def frame(raw_shots) -> ShotsFrame:
+    return ShotsFrame.from_pandas(add_game_number(raw_shots))
+
+
+def test_shots_without_coordinates_are_dropped(raw_shots):
+    raw_shots.loc[0, "x"] = np.nan
+    raw_shots.loc[7, "y"] = np.nan
+    with np.errstate(invalid="raise"):
+        frame = ShotsFrame.from_pandas(add_game_number(raw_shots))
+    assert len(frame) == len(raw_shots) - 2
+    kept = raw_shots.drop(index=[0, 7])
+    assert sorted(frame.x_q.tolist()) == sorted(np.round(kept["x"] * ShotsFrame.XY_SCALE).astype(int).tolist())
+
+
+@pytest.mark.parametrize("court_x, court_y, zone", [
+    (50, 5, "restricted_area"),
+    (40, 20, "paint"),
+    (25, 12, "mid_range"),
+    (2, 8, "corner_three"),
+    (97, 10, "corner_three"),
+    (50, 40, "above_break_three"),
+    (10, 25, "above_break_three"),
+])
+def test_classify_zones(court_x, court_y, zone):
+    codes = classify_zones(np.array([court_x], dtype=np.float64), np.array([court_y], dtype=np.float64))
+    assert ZONES[codes[0]] == zone
+
+
+def test_zone_windows_match_brute_force(frame):
+    index = ShotIndex(frame)
+    size = 3
+    for code in range(len(frame.player_names)):
+        starts, makes, attempts = index.zone_windows(code, size)
+        assert starts.tolist() == list(range(1, index.max_game(code) + 1))
+        for i, start in enumerate(starts):
+            rows = index.window(code, int(start), size)
+            zones = frame.zones[rows]
+            made = frame.made[rows]
+            assert attempts[i].tolist() == np.bincount(zones, minlength=len(ZONES)).tolist()
+            assert makes[i].tolist() == np.bincount(zones[made], minlength=len(ZONES)).tolist()
+
+
+def test_zone_totals_cover_every_shot(frame):
+    makes, attempts = ShotIndex(frame).zone_totals()
+    assert attempts.sum() == len(frame)
+    assert makes.sum() == frame.made.sum()
+
+
+def test_hexbin_conserves_shots():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 100, 2000), rng.uniform(4, 50, 2000)
+    made = rng.random(2000) < 0.4
+    cx, cy, attempts, makes = hexbin(x, y, made, radius=2.0, y_scale=1.3)
+    assert attempts.sum() == 2000
+    assert makes.sum() == made.sum()
+    assert (attempts > 0).all() and (makes <= attempts).all()
+    # No two returned cells share a center
+    assert len({(a, b) for a, b in zip(cx.round(6), cy.round(6))}) == len(cx)
+
+
+def test_hexbin_assigns_each_shot_to_the_nearest_center():
+    radius = 2.0
+    x = np.array([10.0, 10.2, 50.0, 73.3])
+    y = np.array([20.0, 20.1, 30.0, 11.1])
+    cx, cy, attempts, _ = hexbin(x, y, np.ones(4, dtype=bool), radius)
+    # The first two shots are close enough to share a cell
+    assert sorted(attempts.tolist()) == [1, 1, 2]
+    for px, py in zip(x, y):
+        assert np.hypot(cx - px, cy - py).min() <= radius
+
+
+def test_arrow_file_round_trip_is_memory_mapped(frame, tmp_path):
+    path = tmp_path / "shots.arrow"
+    frame.to_arrow_file(str(path))
+    mapped = ShotsFrame.from_arrow_file(str(path))
+    for name in ("player_names", "game_ids", "seasons"):
+        assert getattr(mapped, name).tolist() == getattr(frame, name).tolist()
+    for name in ("player_codes", "game_codes", "season_codes", "x_q", "y_q", "made", "game_number", "time"):
+        column = getattr(mapped, name)
+        np.testing.assert_array_equal(column, getattr(frame, name))
+        # Views of the mapping, not private copies
+        assert not column.flags.writeable
+    pd.testing.assert_frame_equal(mapped.to_pandas(), frame.to_pandas())
+
+
+def test_arrow_ipc_matches_to_pandas(frame):
+    rows = ShotIndex(frame).player_slice(1)
+    table = pa.ipc.open_stream(frame.to_arrow_ipc(rows)).read_all()
+    got = table.to_pandas()
+    expected = frame.to_pandas(rows).drop(columns=["Season"])
+    assert list(got.columns) == list(expected.columns)
+    assert got["playerNameI"].astype(str).tolist() == expected["playerNameI"].tolist()
+    assert got["shotResult"].astype(str).tolist() == expected["shotResult"].tolist()
+    np.testing.assert_allclose(got["x"], expected["x"], atol=1e-5)
+    np.testing.assert_array_equal(got["game_number"], expected["game_number"])
+
+
+def test_arrow_file_keeps_shots_without_a_timestamp(raw_shots, tmp_path):
+    # The game is still numbered from its other shots, so the row is kept
+    raw_shots.loc[3, "timeActual"] = pd.NaT
+    frame = ShotsFrame.from_pandas(add_game_number(raw_shots))
+    assert len(frame) == len(raw_shots)
+    path = tmp_path / "shots.arrow"
+    frame.to_arrow_file(str(path))
+    mapped = ShotsFrame.from_arrow_file(str(path))
+    assert np.isnat(mapped.time).sum() == 1
+    pd.testing.assert_frame_equal(mapped.to_pandas(), frame.to_pandas())
@@ -0,0 +1,76 @@
+import datetime as _dt
+import json
+
+import pytest
+
+from snapshot_manifest import MANIFEST_NAME, SnapshotManifest, current_season
+
+PARAMS = {"Season": "2019-20", "MeasureType": "Base", "LastNGames": 0}
+
+
+@pytest.mark.parametrize("today, season", [
+    (_dt.date(2025, 1, 15), "2024-25"),
+    (_dt.date(2025, 6, 30), "2024-25"),
+    (_dt.date(2025, 7, 1), "2025-26"),
+    (_dt.date(2025, 12, 31), "2025-26"),
+    (_dt.date(2099, 10, 1), "2099-00"),
+])
+def test_current_season_rolls_over_in_july(today, season):
+    assert current_season(today) == season
+
+
+@pytest.fixture
+def manifest(tmp_path) -> SnapshotManifest:
+    return SnapshotManifest(tmp_path)
+
+
+def _record(manifest: SnapshotManifest, season: str, data: bytes = b"rows", params: dict = PARAMS):
+    path = manifest.out_dir / "player_stats" / f"season={season}" / "part-0.parquet"
+    manifest.record(path, season, params, data, rows=2)
+    return path
+
+
+def test_finished_season_is_fetched_once(manifest):
+    path = manifest.out_dir / "player_stats" / "season=2019-20" / "part-0.parquet"
+    assert manifest.needs_fetch(path, "2019-20", PARAMS)
+    _record(manifest, "2019-20")
+    assert path.read_bytes() == b"rows"
+    assert not manifest.needs_fetch(path, "2019-20", PARAMS, ttl=_dt.timedelta(0))
+    assert manifest.needs_fetch(path, "2019-20", PARAMS, force=True)
+
+
+def test_changed_params_or_content_are_refetched(manifest):
+    path = _record(manifest, "2019-20")
+    assert manifest.needs_fetch(path, "2019-20", dict(PARAMS, LastNGames=5))
+    path.write_bytes(b"edited")
+    assert manifest.needs_fetch(path, "2019-20", PARAMS)
+    path.unlink()
+    assert manifest.needs_fetch(path, "2019-20", PARAMS)
+
+
+def test_current_season_expires_after_ttl(manifest):
+    season = current_season()
+    path = _record(manifest, season)
+    assert not manifest.needs_fetch(path, season, PARAMS, ttl=_dt.timedelta(hours=1))
+    key = path.relative_to(manifest.out_dir).as_posix()
+    fetched_at = _dt.datetime.now(_dt.timezone.utc) - _dt.timedelta(hours=2)
+    manifest.entries[key]["fetched_at"] = fetched_at.isoformat(timespec="seconds")
+    assert manifest.needs_fetch(path, season, PARAMS, ttl=_dt.timedelta(hours=1))
+    assert not manifest.needs_fetch(path, season, PARAMS, ttl=_dt.timedelta(hours=3))
+
+
+def test_identical_content_is_not_rewritten(manifest):
+    path = _record(manifest, "2019-20")
+    mtime = path.stat().st_mtime_ns
+    assert not manifest.record(path, "2019-20", PARAMS, b"rows", rows=2)
+    assert path.stat().st_mtime_ns == mtime
+    assert manifest.record(path, "2019-20", PARAMS, b"new rows", rows=3)
+    assert path.read_bytes() == b"new rows"
+
+
+def test_manifest_round_trips_through_save(manifest):
+    path = _record(manifest, "2019-20")
+    manifest.save()
+    saved = json.loads((manifest.out_dir / MANIFEST_NAME).read_text())
+    assert saved["player_stats/season=2019-20/part-0.parquet"]["rows"] == 2
+    assert not SnapshotManifest(manifest.out_dir).needs_fetch(path, "2019-20", PARAMS)
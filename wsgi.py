@@ -0,0 +1,10 @@
+"""Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py sets preload_app, so this module is imported once in the
+master: the shots data, court geometry and rendered /shots page are built
+here before any worker is forked, and every worker starts warm.
+"""
+
+from app import create_app
+
+app = create_app(preload=True)